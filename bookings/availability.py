@@ -0,0 +1,151 @@
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, OperationalError, transaction
+from django.db.models import Exists, OuterRef
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.settings import api_settings
+from rooms.models import Room
+from .models import Booking, RoomNight
+
+
+def nights_between(check_in, check_out):
+    """Every night of a stay, check_in included and check_out excluded"""
+
+    return [
+        check_in + timedelta(days=day) for day in range((check_out - check_in).days)
+    ]
+
+
+def booked_nights(check_in, check_out):
+    return RoomNight.objects.filter(night__gte=check_in, night__lt=check_out)
+
+
+def is_room_available(room, check_in, check_out):
+    # (room, night) unique 인덱스 범위만 읽으면 되기 때문에 예약이 많아도 빠르다.
+    return not booked_nights(check_in, check_out).filter(room=room).exists()
+
+
+def available_rooms(check_in, check_out, rooms=None):
+    if rooms is None:
+        rooms = Room.objects.all()
+    return rooms.filter(
+        ~Exists(booked_nights(check_in, check_out).filter(room=OuterRef("pk")))
+    )
+
+
+DATES_TAKEN = "Those(or some) of those dates are already taken."
+
+
+def takes_nights(booking):
+    return (
+        booking.kind == Booking.BookingKindChoices.ROOM
+        and booking.room_id
+        and booking.check_in
+        and booking.check_out
+    )
+
+
+def check_room_nights(booking):
+    """Raise ValidationError if another booking already holds one of these nights
+
+    Called before the booking is written, so the admin and re-saves of legacy
+    overlapping bookings (the RoomNight backfill kept only the first one) get
+    a validation error instead of the unique constraint failing in post_save.
+    """
+
+    if not takes_nights(booking):
+        return
+    taken = booked_nights(booking.check_in, booking.check_out).filter(
+        room_id=booking.room_id
+    )
+    if booking.pk is not None:
+        taken = taken.exclude(booking_id=booking.pk)
+    if taken.exists():
+        raise DjangoValidationError(DATES_TAKEN)
+
+
+def sync_room_nights(booking):
+    """Rewrite the booked nights of a booking from its current dates"""
+
+    RoomNight.objects.filter(booking=booking).delete()
+    if not takes_nights(booking):
+        return
+    RoomNight.objects.bulk_create(
+        [
+            RoomNight(room_id=booking.room_id, booking=booking, night=night)
+            for night in nights_between(booking.check_in, booking.check_out)
+        ]
+    )
+
+
+# 잠금 경합으로 실패한 경우만 다시 시도한다. (SQLite 메시지, PostgreSQL SQLSTATE, MySQL 에러 코드)
+LOCK_MESSAGES = ("database is locked", "database table is locked")
+LOCK_SQLSTATES = ("40001", "40P01")
+LOCK_ERROR_CODES = (1205, 1213)
+
+
+def is_lock_contention(error):
+    cause = error.__cause__
+    if getattr(cause, "pgcode", None) in LOCK_SQLSTATES:
+        return True
+    if error.args and error.args[0] in LOCK_ERROR_CODES:
+        return True
+    return any(message in str(error) for message in LOCK_MESSAGES)
+
+
+class BookingBusy(APIException):
+    status_code = 503
+    default_detail = "Too many bookings for this room right now, try again."
+    default_code = "booking_busy"
+
+
+def create_room_booking(room_pk, user, data):
+    """Validate and save a room booking as one transaction
+
+    The room row is locked with select_for_update so two requests for the same
+    room are checked one after another. On databases that ignore the lock
+    (SQLite) the unique (room, night) constraint still rejects the second one.
+    Lock contention ("database is locked", serialization failures and
+    deadlocks) is retried and answered with 503 once the retries run out;
+    any other OperationalError is raised as is.
+    """
+
+    from .serializers import CreateRoomBookingSerializer
+
+    retries = settings.BOOKING_RETRIES
+    for attempt in range(retries + 1):
+        serializer = None
+        try:
+            with transaction.atomic():
+                room = Room.objects.select_for_update().get(pk=room_pk)
+                serializer = CreateRoomBookingSerializer(
+                    data=data, context={"room": room}
+                )
+                serializer.is_valid(raise_exception=True)
+                return serializer.save(
+                    room=room,
+                    user=user,
+                    kind=Booking.BookingKindChoices.ROOM,
+                )
+        except DjangoValidationError:
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [DATES_TAKEN]})
+        except IntegrityError:
+            # 동시에 들어온 다른 예약이 먼저 같은 날짜를 가져갔을 때만 날짜가 찼다고 알려준다.
+            # 다른 제약(FK, NOT NULL) 위반은 버그이므로 그대로 올린다.
+            dates = serializer.validated_data if serializer is not None else None
+            if dates and not is_room_available(
+                room_pk, dates["check_in"], dates["check_out"]
+            ):
+                raise ValidationError(
+                    {api_settings.NON_FIELD_ERRORS_KEY: [DATES_TAKEN]}
+                )
+            raise
+        except OperationalError as error:
+            # 테이블이 없거나 연결이 끊긴 것 같은 다른 오류는 숨기지 않는다.
+            if not is_lock_contention(error):
+                raise
+            if attempt == retries:
+                raise BookingBusy
+            time.sleep(settings.BOOKING_RETRY_DELAY * (2**attempt))
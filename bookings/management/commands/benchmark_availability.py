@@ -0,0 +1,111 @@
+import random
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from bookings.availability import available_rooms, is_room_available, nights_between
+from bookings.models import Booking, RoomNight
+from rooms.models import Room
+from users.models import User
+
+
+class Command(BaseCommand):
+
+    help = (
+        "Time availability lookups against generated bookings (rolled back afterwards)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rooms", type=int, default=10_000)
+        parser.add_argument("--bookings", type=int, default=1_000_000)
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--chunk-size", type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        # 벤치마크용 데이터는 전부 롤백해서 DB에 남기지 않는다.
+        with transaction.atomic():
+            self.seed(options)
+            self.measure(options)
+            transaction.set_rollback(True)
+
+    def seed(self, options):
+        started = time.perf_counter()
+        user = User.objects.create(username=f"benchmark-{time.time_ns()}")
+        rooms = Room.objects.bulk_create(
+            [
+                Room(
+                    name=f"Benchmark {index}",
+                    price=random.randint(10, 500) * 1000,
+                    rooms=1,
+                    toilets=1,
+                    address="Benchmark",
+                    kind=Room.RooomKindChoices.ENTIRE_PLACE,
+                    owner=user,
+                )
+                for index in range(options["rooms"])
+            ],
+            batch_size=options["chunk_size"],
+        )
+        self.today = timezone.localtime(timezone.now()).date()
+        remaining = options["bookings"]
+        while remaining:
+            size = min(remaining, options["chunk_size"])
+            bookings = []
+            for _ in range(size):
+                check_in = self.today + timedelta(
+                    days=random.randrange(options["days"])
+                )
+                bookings.append(
+                    Booking(
+                        kind=Booking.BookingKindChoices.ROOM,
+                        user=user,
+                        room=random.choice(rooms),
+                        check_in=check_in,
+                        check_out=check_in + timedelta(days=random.randint(1, 7)),
+                        guests=1,
+                    )
+                )
+            bookings = Booking.objects.bulk_create(bookings)
+            # bulk_create는 signal을 보내지 않으므로 RoomNight를 직접 만든다. 겹치는 날짜는 버린다.
+            RoomNight.objects.bulk_create(
+                [
+                    RoomNight(room_id=booking.room_id, booking=booking, night=night)
+                    for booking in bookings
+                    for night in nights_between(booking.check_in, booking.check_out)
+                ],
+                ignore_conflicts=True,
+            )
+            remaining -= size
+        self.rooms = rooms
+        self.stdout.write(
+            f"Seeded {options['rooms']} rooms / {options['bookings']} bookings "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+
+    def measure(self, options):
+        single, search = [], []
+        for _ in range(options["repeat"]):
+            check_in = self.today + timedelta(days=random.randrange(options["days"]))
+            check_out = check_in + timedelta(days=random.randint(1, 7))
+
+            started = time.perf_counter()
+            is_room_available(random.choice(self.rooms), check_in, check_out)
+            single.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            list(
+                available_rooms(check_in, check_out).order_by("-created_at", "-pk")[:20]
+            )
+            search.append(time.perf_counter() - started)
+
+        for label, timings in (
+            ("is_room_available", single),
+            ("available_rooms[:20]", search),
+        ):
+            timings.sort()
+            self.stdout.write(
+                f"{label}: p50 {timings[len(timings) // 2] * 1000:.2f}ms / "
+                f"max {timings[-1] * 1000:.2f}ms"
+            )
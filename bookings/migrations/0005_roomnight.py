@@ -0,0 +1,78 @@
+# Generated by Django 4.1.6 on 2026-10-18 15:24
+
+from datetime import timedelta
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_room_nights(apps, schema_editor):
+    Booking = apps.get_model("bookings", "Booking")
+    RoomNight = apps.get_model("bookings", "RoomNight")
+    bookings = Booking.objects.filter(
+        kind="room",
+        room__isnull=False,
+        check_in__isnull=False,
+        check_out__isnull=False,
+    )
+    for booking in bookings.iterator():
+        # 예전 검증은 방을 구분하지 않아서 겹치는 예약이 있을 수 있다. 먼저 저장된 예약을 남긴다.
+        RoomNight.objects.bulk_create(
+            [
+                RoomNight(
+                    room_id=booking.room_id,
+                    booking=booking,
+                    night=booking.check_in + timedelta(days=day),
+                )
+                for day in range((booking.check_out - booking.check_in).days)
+            ],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0005_room_rooms_room_created_2438c1_idx"),
+        ("bookings", "0004_booking_experience_check_in_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RoomNight",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("night", models.DateField()),
+                (
+                    "booking",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="nights",
+                        to="bookings.booking",
+                    ),
+                ),
+                (
+                    "room",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="booked_nights",
+                        to="rooms.room",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="roomnight",
+            constraint=models.UniqueConstraint(
+                fields=("room", "night"), name="unique_room_night"
+            ),
+        ),
+        migrations.RunPython(fill_room_nights, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.1.6 on 2026-10-18 15:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0005_roomnight"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["room", "kind", "check_in"],
+                name="bookings_bo_room_id_aa35aa_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["experience", "kind", "experience_check_in"],
+                name="bookings_bo_experie_8a3941_idx",
+            ),
+        ),
+    ]
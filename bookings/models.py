@@ -60,3 +60,45 @@ class Booking(CommonModel):
 
     def __str__(self) -> str:
         return f"{self.kind.title()} booking for: {self.user}"
+
+    def clean(self):
+        # admin에서 겹치는 예약을 저장하려 하면 폼 에러로 보여준다.
+        from .availability import check_room_nights
+
+        check_room_nights(self)
+
+    class Meta:
+        indexes = [
+            # RoomBookings / ExperienceBookings 의 다가오는 예약 조회
+            models.Index(fields=["room", "kind", "check_in"]),
+            models.Index(fields=["experience", "kind", "experience_check_in"]),
+        ]
+
+
+class RoomNight(models.Model):
+
+    """One booked night of a room, the availability index for room bookings"""
+
+    room = models.ForeignKey(
+        "rooms.Room",
+        on_delete=models.CASCADE,
+        related_name="booked_nights",
+    )
+    booking = models.ForeignKey(
+        "bookings.Booking",
+        on_delete=models.CASCADE,
+        related_name="nights",
+    )
+    night = models.DateField()
+
+    def __str__(self) -> str:
+        return f"{self.room} / {self.night}"
+
+    class Meta:
+        constraints = [
+            # 한 방의 같은 날짜는 하나의 예약만 가질 수 있다.
+            models.UniqueConstraint(
+                fields=["room", "night"],
+                name="unique_room_night",
+            ),
+        ]
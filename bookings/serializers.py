@@ -1,6 +1,7 @@
 from django.utils import timezone
 from rest_framework import serializers
 from .models import Booking
+from .availability import is_room_available
 
 
 class CreateRoomBookingSerializer(serializers.ModelSerializer):
@@ -36,11 +37,9 @@ class CreateRoomBookingSerializer(serializers.ModelSerializer):
     def validate(self, data):
         if data["check_out"] <= data["check_in"]:
             raise serializers.ValidationError("Check in should be amaller than check out.")
-        if Booking.objects.filter(
-            # want 5.10~ 20
-            check_in__lte=data["check_out"],  # 내가 나가기 전에 기존에 들어와있는게 있으며,
-            check_out__gte=data["check_in"],  # 덧붙여서 내가 들어오고나서 기존에 나가는 예약이 있는지.
-        ).exists():
+        # 예약하려는 방은 view에서 context로 넘겨준다.
+        room = self.context.get("room")
+        if room and not is_room_available(room, data["check_in"], data["check_out"]):
             raise serializers.ValidationError("Those(or some) of those dates are already taken.")
         return data
 
@@ -81,7 +80,8 @@ class PublicBookingSerializer(serializers.ModelSerializer):
         model = Booking
         fields = (
             "pk",
-            "check",
+            "check_in",
+            "check_out",
             "experience_check_in",
             "experience_check_out",
             "experience_time",
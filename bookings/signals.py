@@ -0,0 +1,15 @@
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+from .availability import check_room_nights, sync_room_nights
+from .models import Booking
+
+
+@receiver(pre_save, sender=Booking)
+def check_room_nights_free(sender, instance, **kwargs):
+    # unique 제약에 걸려 post_save에서 500이 나기 전에 겹치는 날짜를 확인한다.
+    check_room_nights(instance)
+
+
+@receiver(post_save, sender=Booking)
+def update_room_nights(sender, instance, **kwargs):
+    sync_room_nights(instance)
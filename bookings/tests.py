@@ -1,3 +1,186 @@
-from django.test import TestCase
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest import mock
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, OperationalError, connection
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase, APITransactionTestCase
+from common.testing import create_room
+from users.models import User
+from .availability import available_rooms, create_room_booking, is_room_available
+from .models import Booking, RoomNight
 
-# Create your tests here.
+
+class BookingTestMixin:
+    def create_room(self, name="Room"):
+        return create_room(self.user, name=name)
+
+    def day(self, offset):
+        return timezone.localtime(timezone.now()).date() + timedelta(days=offset)
+
+    def book(self, room, check_in, check_out):
+        return Booking.objects.create(
+            kind=Booking.BookingKindChoices.ROOM,
+            user=self.user,
+            room=room,
+            check_in=self.day(check_in),
+            check_out=self.day(check_out),
+            guests=1,
+        )
+
+
+class TestRoomAvailability(BookingTestMixin, APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="test")
+        self.room = self.create_room()
+        self.other_room = self.create_room("Other Room")
+        self.book(self.room, 10, 13)
+
+    def test_booked_nights(self):
+        nights = RoomNight.objects.filter(room=self.room).values_list(
+            "night", flat=True
+        )
+        self.assertEqual(list(nights), [self.day(10), self.day(11), self.day(12)])
+
+    def test_is_room_available(self):
+        self.assertFalse(is_room_available(self.room, self.day(12), self.day(14)))
+        self.assertFalse(is_room_available(self.room, self.day(8), self.day(11)))
+        # 체크아웃 날에 다른 손님이 체크인 할 수 있다.
+        self.assertTrue(is_room_available(self.room, self.day(13), self.day(15)))
+        self.assertTrue(is_room_available(self.room, self.day(8), self.day(10)))
+        self.assertTrue(is_room_available(self.other_room, self.day(10), self.day(13)))
+
+    def test_available_rooms(self):
+        rooms = available_rooms(self.day(11), self.day(12))
+        self.assertEqual(list(rooms), [self.other_room])
+
+    def test_moving_booking_frees_nights(self):
+        booking = Booking.objects.get(room=self.room)
+        booking.check_in = self.day(20)
+        booking.check_out = self.day(21)
+        booking.save()
+        self.assertTrue(is_room_available(self.room, self.day(10), self.day(13)))
+        self.assertFalse(is_room_available(self.room, self.day(20), self.day(21)))
+
+    def test_overlapping_save(self):
+        # 예전 데이터에는 RoomNight 없이 겹치는 예약이 남아 있을 수 있다.
+        (legacy,) = Booking.objects.bulk_create(
+            [
+                Booking(
+                    kind=Booking.BookingKindChoices.ROOM,
+                    user=self.user,
+                    room=self.room,
+                    check_in=self.day(11),
+                    check_out=self.day(12),
+                    guests=1,
+                )
+            ]
+        )
+        legacy.guests = 2
+        with self.assertRaises(ValidationError):
+            legacy.save()
+        with self.assertRaises(ValidationError):
+            legacy.full_clean()
+        with self.assertRaises(ValidationError):
+            self.book(self.room, 12, 14)
+        self.assertEqual(RoomNight.objects.filter(room=self.room).count(), 3)
+
+    def test_retries_run_out(self):
+        self.client.force_login(self.user)
+        url = f"/api/v1/rooms/{self.other_room.pk}/bookings"
+        data = {"check_in": self.day(10), "check_out": self.day(13), "guests": 2}
+        with mock.patch(
+            "bookings.serializers.CreateRoomBookingSerializer.save",
+            side_effect=OperationalError("database is locked"),
+        ) as save, mock.patch("bookings.availability.time.sleep"):
+            response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(save.call_count, settings.BOOKING_RETRIES + 1)
+
+    def test_other_operational_error(self):
+        # 잠금 경합이 아닌 오류는 다시 시도하지도, 503으로 바꾸지도 않는다.
+        data = {"check_in": self.day(10), "check_out": self.day(13), "guests": 2}
+        with mock.patch(
+            "bookings.serializers.CreateRoomBookingSerializer.save",
+            side_effect=OperationalError("no such table: bookings_booking"),
+        ) as save:
+            with self.assertRaises(OperationalError):
+                create_room_booking(self.other_room.pk, self.user, data)
+        self.assertEqual(save.call_count, 1)
+
+    def test_other_integrity_error(self):
+        # 날짜가 겹친 것이 아닌 제약 위반을 "이미 예약된 날짜"로 바꾸면 안 된다.
+        data = {"check_in": self.day(10), "check_out": self.day(13), "guests": 2}
+        with mock.patch(
+            "bookings.serializers.CreateRoomBookingSerializer.save",
+            side_effect=IntegrityError("NOT NULL constraint failed"),
+        ):
+            with self.assertRaises(IntegrityError):
+                create_room_booking(self.other_room.pk, self.user, data)
+
+    def test_create_booking(self):
+        self.client.force_login(self.user)
+        url = f"/api/v1/rooms/{self.other_room.pk}/bookings"
+        data = {"check_in": self.day(10), "check_out": self.day(13), "guests": 2}
+
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["check_in"], str(self.day(10)))
+
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Booking.objects.filter(room=self.other_room).count(), 1)
+
+
+class TestConcurrentRoomBooking(BookingTestMixin, APITransactionTestCase):
+    WORKERS = 8
+
+    def setUp(self):
+        self.user = User.objects.create(username="test")
+        self.room = self.create_room()
+
+    def post_booking(self, check_in, check_out):
+        # 스레드마다 별도의 DB 연결을 사용하므로 끝나면 닫아준다.
+        try:
+            client = APIClient()
+            client.force_authenticate(self.user)
+            return client.post(
+                f"/api/v1/rooms/{self.room.pk}/bookings",
+                {
+                    "check_in": self.day(check_in),
+                    "check_out": self.day(check_out),
+                    "guests": 1,
+                },
+            ).status_code
+        finally:
+            connection.close()
+
+    def test_same_dates(self):
+        with ThreadPoolExecutor(max_workers=self.WORKERS) as executor:
+            futures = [
+                executor.submit(self.post_booking, 10, 12)
+                for _ in range(self.WORKERS * 3)
+            ]
+            statuses = [future.result() for future in futures]
+
+        self.assertEqual(statuses.count(200), 1)
+        # 나머지는 날짜가 찼다는 400이거나, 잠금 재시도를 다 쓴 503이어야 한다. 500은 없다.
+        self.assertEqual(statuses.count(400) + statuses.count(503), len(statuses) - 1)
+        self.assertEqual(Booking.objects.filter(room=self.room).count(), 1)
+
+    def test_overlapping_dates(self):
+        with ThreadPoolExecutor(max_workers=self.WORKERS) as executor:
+            futures = [
+                executor.submit(self.post_booking, day, day + 3)
+                for day in range(10, 20)
+            ]
+            [future.result() for future in futures]
+
+        nights = list(
+            RoomNight.objects.filter(room=self.room).values_list("night", flat=True)
+        )
+        self.assertEqual(len(nights), len(set(nights)))
+        self.assertEqual(
+            len(nights), Booking.objects.filter(room=self.room).count() * 3
+        )
@@ -0,0 +1,51 @@
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+def version_key(kind, pk):
+    return f"detail:{kind}:{pk}:version"
+
+
+def get_version(kind, pk):
+    key = version_key(kind, pk)
+    version = cache.get(key)
+    if version is None:
+        # 버전이 캐시에서 사라졌다면 예전 값과 겹치지 않도록 현재 시각으로 새로 시작한다.
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(kind, pk):
+    key = version_key(kind, pk)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def invalidate_detail(kind, pk):
+    """Make the cached detail payload of an object stale
+
+    The version is bumped right away and once more after the transaction
+    commits, so a request that rebuilt the payload from the old rows in
+    between cannot leave it cached.
+    """
+
+    if not pk:
+        return
+    bump_version(kind, pk)
+    transaction.on_commit(lambda: bump_version(kind, pk))
+
+
+def get_cached_detail(kind, pk, build):
+    """Return the shared (user independent) detail payload, building it on a miss"""
+
+    key = f"detail:{kind}:{pk}:{get_version(kind, pk)}"
+    payload = cache.get(key)
+    if payload is None:
+        payload = build()
+        cache.set(key, payload, settings.DETAIL_CACHE_TIMEOUT)
+    return payload
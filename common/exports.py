@@ -0,0 +1,89 @@
+import csv
+import zlib
+from django.core.serializers.json import DjangoJSONEncoder
+from bookings.models import Booking
+from reviews.models import Review
+from rooms.models import Room
+
+DATASETS = {
+    "rooms": Room,
+    "bookings": Booking,
+    "reviews": Review,
+}
+
+TYPES = ("ndjson", "csv")
+
+# 한 번에 내보내는 바이트 크기. 줄마다 write 하지 않도록 모아서 보낸다.
+BUFFER_SIZE = 64 * 1024
+
+
+class Echo:
+
+    """File-like object whose write() just hands the line back to csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def get_columns(model):
+    return [field.attname for field in model._meta.concrete_fields]
+
+
+def iter_rows(model, chunk_size):
+    # iterator()는 결과를 캐시하지 않고 chunk_size만큼씩 읽어오기 때문에 테이블 크기와 상관없이 메모리가 일정하다.
+    return (
+        model.objects.order_by("pk")
+        .values_list(*get_columns(model))
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def ndjson_lines(columns, rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(dict(zip(columns, row))) + "\n"
+
+
+def csv_lines(columns, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def buffered(lines):
+    buffer, size = [], 0
+    for line in lines:
+        data = line.encode()
+        buffer.append(data)
+        size += len(data)
+        if size >= BUFFER_SIZE:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def gzipped(chunks):
+    # wbits=31 이면 gzip 헤더가 붙은 스트림이 나온다.
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export(name, export_type="ndjson", gzip=False, chunk_size=2000):
+    """Yield the bytes of a whole table as NDJSON or CSV, optionally gzipped"""
+
+    model = DATASETS[name]
+    columns = get_columns(model)
+    rows = iter_rows(model, chunk_size)
+    lines = (
+        csv_lines(columns, rows)
+        if export_type == "csv"
+        else ndjson_lines(columns, rows)
+    )
+    chunks = buffered(lines)
+    return gzipped(chunks) if gzip else chunks
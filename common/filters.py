@@ -0,0 +1,37 @@
+from rest_framework import serializers
+
+# 목록에서 고를 수 있는 정렬. 마지막의 pk가 같은 값들 사이의 순서를 고정해서
+# 페이지를 넘겨도 결과가 섞이지 않는다. 각 정렬은 (필드, id) 인덱스를 탄다.
+SORTS = {
+    "-created_at": ("-created_at", "-pk"),
+    "price": ("price", "pk"),
+    "-price": ("-price", "-pk"),
+    # 평점이 높은 순서
+    "rating": ("-rating_average", "-pk"),
+}
+
+
+class ListingFilterSerializer(serializers.Serializer):
+
+    """Price range and sort accepted by the room and experience lists"""
+
+    min_price = serializers.IntegerField(required=False, min_value=0)
+    max_price = serializers.IntegerField(required=False, min_value=0)
+    sort = serializers.ChoiceField(choices=list(SORTS), default="-created_at")
+
+    def validate(self, data):
+        min_price = data.get("min_price")
+        max_price = data.get("max_price")
+        if min_price is not None and max_price is not None and max_price < min_price:
+            raise serializers.ValidationError(
+                "min_price should be smaller than max_price."
+            )
+        return data
+
+
+def filter_price(queryset, filters):
+    if "min_price" in filters:
+        queryset = queryset.filter(price__gte=filters["min_price"])
+    if "max_price" in filters:
+        queryset = queryset.filter(price__lte=filters["max_price"])
+    return queryset
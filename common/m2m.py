@@ -0,0 +1,22 @@
+from rest_framework.exceptions import ParseError
+
+
+def fetch_related(model, pks):
+    """Fetch the objects for a list of pks with one query
+
+    Every pk that does not exist is reported in a single ParseError, so the
+    client can fix the whole request at once.
+    """
+
+    try:
+        pks = {int(pk) for pk in pks}
+    except (TypeError, ValueError):
+        raise ParseError(
+            f"{model._meta.verbose_name_plural.title()} should be a list of ids."
+        )
+    objects = model.objects.in_bulk(pks)
+    missing = sorted(pks - objects.keys())
+    if missing:
+        missing = ", ".join(map(str, missing))
+        raise ParseError(f"{model._meta.verbose_name.title()} not found: {missing}")
+    return list(objects.values())
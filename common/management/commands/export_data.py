@@ -0,0 +1,31 @@
+import sys
+from django.core.management.base import BaseCommand
+from common.exports import DATASETS, TYPES, export
+
+
+class Command(BaseCommand):
+
+    help = "Stream a table (rooms, bookings or reviews) as NDJSON or CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", choices=sorted(DATASETS))
+        parser.add_argument("--type", choices=TYPES, default="ndjson")
+        parser.add_argument("--gzip", action="store_true")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument("-o", "--output", help="file to write, stdout when omitted")
+
+    def handle(self, *args, **options):
+        chunks = export(
+            options["name"],
+            options["type"],
+            options["gzip"],
+            options["chunk_size"],
+        )
+        if options["output"]:
+            with open(options["output"], "wb") as output:
+                for chunk in chunks:
+                    output.write(chunk)
+        else:
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
@@ -0,0 +1,88 @@
+import threading
+from collections import deque
+
+# 분위수를 계산할 때 쓰는 최근 관측값의 개수
+SAMPLE_SIZE = 1024
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Summary:
+
+    """Count, sum and the most recent samples of one labelled measurement"""
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.samples = deque(maxlen=SAMPLE_SIZE)
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        self.samples.append(value)
+
+    def quantiles(self):
+        samples = sorted(self.samples)
+        if not samples:
+            return {}
+        return {
+            quantile: samples[min(int(quantile * len(samples)), len(samples) - 1)]
+            for quantile in QUANTILES
+        }
+
+
+class Registry:
+
+    """In-process store of summaries, rendered in the Prometheus text format
+
+    Each worker process keeps its own registry, so a scrape shows the
+    process that answered it.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics = {}
+
+    def observe(self, name, help_text, labels, value):
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            metric = self.metrics.setdefault(name, (help_text, {}))
+            metric[1].setdefault(key, Summary()).observe(value)
+
+    def get(self, name, **labels):
+        with self.lock:
+            help_text, summaries = self.metrics.get(name, (None, {}))
+            return summaries.get(tuple(sorted(labels.items())))
+
+    def clear(self):
+        with self.lock:
+            self.metrics.clear()
+
+    def render(self):
+        lines = []
+        with self.lock:
+            for name, (help_text, summaries) in sorted(self.metrics.items()):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} summary")
+                for key, summary in sorted(summaries.items()):
+                    for quantile, value in summary.quantiles().items():
+                        labels = format_labels(key + (("quantile", str(quantile)),))
+                        lines.append(f"{name}{labels} {value:g}")
+                    lines.append(f"{name}_count{format_labels(key)} {summary.count}")
+                    lines.append(f"{name}_sum{format_labels(key)} {summary.sum:g}")
+        return "\n".join(lines) + "\n"
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (
+        (
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in labels
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+REGISTRY = Registry()
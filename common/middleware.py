@@ -0,0 +1,101 @@
+import time
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from .metrics import REGISTRY
+from .nplusone import QueryShapeCounter, logger
+
+
+class QueryTimer:
+
+    """connection.execute_wrapper that counts queries and adds up their time"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - started
+
+
+class RequestMetricsMiddleware:
+
+    """Time every request, count its queries and report them per view
+
+    Enabled with settings.REQUEST_METRICS. The numbers are sent back in a
+    Server-Timing header and collected for the /api/v1/_metrics endpoint.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        started = time.perf_counter()
+        with connection.execute_wrapper(timer):
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        response["Server-Timing"] = (
+            f'db;dur={timer.duration * 1000:.1f};desc="{timer.count} queries", '
+            f"app;dur={duration * 1000:.1f}"
+        )
+        # url 이름이 없으면 view_name은 "rooms.views.Rooms" 같은 경로가 된다.
+        match = request.resolver_match
+        labels = {
+            "view": match.view_name if match else "unmatched",
+            "method": request.method,
+        }
+        REGISTRY.observe(
+            "http_request_duration_seconds",
+            "Wall time of the request",
+            labels,
+            duration,
+        )
+        REGISTRY.observe(
+            "http_request_db_queries",
+            "Database queries executed by the request",
+            labels,
+            timer.count,
+        )
+        REGISTRY.observe(
+            "http_request_db_duration_seconds",
+            "Time spent in database queries",
+            labels,
+            timer.duration,
+        )
+        return response
+
+
+class NPlusOneMiddleware:
+
+    """Flag requests that run the same query shape more than NPLUSONE_THRESHOLD times
+
+    Meant for development, staging and tests. With NPLUSONE_RAISE the request
+    fails with NPlusOneError, otherwise a warning with the stack is logged.
+    Queries slower than SLOW_QUERY_MS are logged as well.
+    """
+
+    def __init__(self, get_response):
+        if settings.NPLUSONE_THRESHOLD is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryShapeCounter(
+            settings.NPLUSONE_THRESHOLD,
+            raise_error=settings.NPLUSONE_RAISE,
+            slow_query_ms=settings.SLOW_QUERY_MS,
+        )
+        with connection.execute_wrapper(counter):
+            response = self.get_response(request)
+        for problem in counter.problems:
+            logger.warning("%s %s: %s", request.method, request.path, problem)
+        return response
@@ -13,3 +13,29 @@ class CommonModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class DenormalizedFieldsMixin:
+
+    """Keep denormalized columns out of ordinary saves
+
+    The columns named in denormalized_fields are maintained with F() updates
+    (e.g. the rating aggregates). A full save() of an existing row from the
+    admin or an API view would otherwise write back the values it loaded and
+    lose any change made in between.
+    """
+
+    denormalized_fields = ()
+
+    def save(self, *args, **kwargs):
+        if (
+            not self._state.adding
+            and not kwargs.get("force_insert")
+            and kwargs.get("update_fields") is None
+        ):
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.denormalized_fields
+            ]
+        super().save(*args, **kwargs)
@@ -0,0 +1,100 @@
+import logging
+import os
+import re
+import time
+import traceback
+from collections import Counter
+from django.conf import settings
+from django.db.models import QuerySet
+from django.views.debug import SafeExceptionReporterFilter
+
+logger = logging.getLogger(__name__)
+
+# IN (%s, %s, ...) 처럼 값의 개수만 다른 쿼리는 같은 모양으로 본다.
+PLACEHOLDERS = re.compile(r"\((?:%s, )+%s\)")
+IGNORED = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+class NPlusOneError(Exception):
+    pass
+
+
+def get_shape(sql):
+    return PLACEHOLDERS.sub("(...)", sql)
+
+
+def project_stack(limit=8):
+    """The innermost frames that belong to this project, not Django or DRF"""
+
+    base_dir = str(settings.BASE_DIR)
+    frames = [
+        frame
+        for frame in traceback.extract_stack()
+        if frame.filename.startswith(base_dir)
+        and "site-packages" not in frame.filename
+        and frame.filename != __file__
+        and os.sep + "tests.py" not in frame.filename
+    ]
+    return "".join(traceback.format_list(frames[-limit:]))
+
+
+class QueryShapeCounter:
+
+    """connection.execute_wrapper that flags repeated and slow queries
+
+    A query shape (the SQL without its parameters) executed more than
+    threshold times in one unit of work is almost always an N+1 from a
+    serializer method or a loop, so the project frames that ran it are kept
+    to point at the code responsible.
+    """
+
+    def __init__(self, threshold, raise_error=False, slow_query_ms=None):
+        self.threshold = threshold
+        self.raise_error = raise_error
+        self.slow_query_ms = slow_query_ms
+        self.counts = Counter()
+        self.problems = []
+        self.raised = False
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration = (time.perf_counter() - started) * 1000
+        if self.slow_query_ms is not None and duration >= self.slow_query_ms:
+            logger.warning(
+                "Slow query (%.1fms): %s\n%s", duration, sql, project_stack()
+            )
+        # 에러를 낸 뒤 에러 리포트를 만들며 실행되는 쿼리는 세지 않는다.
+        if self.raised or sql.startswith(IGNORED):
+            return result
+
+        shape = get_shape(sql)
+        self.counts[shape] += 1
+        if self.counts[shape] == self.threshold + 1:
+            message = (
+                f"The same query ran more than {self.threshold} times:\n{shape}\n"
+                f"Executed from:\n{project_stack()}"
+            )
+            self.problems.append(message)
+            if self.raise_error:
+                self.raised = True
+                raise NPlusOneError(message)
+        return result
+
+
+class QuerySetReporterFilter(SafeExceptionReporterFilter):
+
+    """Error report filter that shows unevaluated querysets as their SQL
+
+    The default report calls repr() on every local variable, which runs a
+    query (LIMIT 21) for each queryset in the traceback.
+    """
+
+    def cleanse_special_types(self, request, value):
+        if isinstance(value, QuerySet) and value._result_cache is None:
+            try:
+                sql = str(value.query)
+            except Exception:
+                sql = "(empty)"
+            return f"<{type(value).__name__} not evaluated: {sql}>"
+        return super().cleanse_special_types(request, value)
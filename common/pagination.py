@@ -0,0 +1,150 @@
+import base64
+import binascii
+import bisect
+import json
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination:
+
+    """Keyset pagination over an ordering whose last field is unique (usually pk)
+
+    Instead of OFFSET, every page continues from the ordering values of the
+    previous page's last row, so page 100 costs the same as page 1 as long as
+    the ordering is backed by an index.
+    """
+
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self, ordering=("-created_at", "-pk"), page_size=None):
+        self.ordering = tuple(ordering)
+        self.page_size = page_size or settings.PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request):
+        self.request = request
+        self.model = queryset.model
+        queryset = queryset.order_by(*self.ordering)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self.seek(self.decode_cursor(cursor)))
+
+        # 다음 페이지가 있는지 알기 위해 한 개를 더 가져온다.
+        page = list(queryset[: self.page_size + 1])
+        self.has_next = len(page) > self.page_size
+        self.page = page[: self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "results": data,
+            }
+        )
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        values = [getattr(last, self.field_name(name)) for name in self.ordering]
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(values)
+        )
+
+    def field_name(self, name):
+        return name.lstrip("-")
+
+    def seek(self, values):
+        # (a, b) > (x, y) 를 a > x OR (a = x AND b > y) 로 풀어서 쓴다.
+        condition = Q()
+        for index, name in enumerate(self.ordering):
+            lookup = "lt" if name.startswith("-") else "gt"
+            step = Q(**{f"{self.field_name(name)}__{lookup}": values[index]})
+            for previous, value in zip(self.ordering[:index], values):
+                step &= Q(**{self.field_name(previous): value})
+            condition |= step
+        return condition
+
+    def encode_cursor(self, values):
+        # DjangoJSONEncoder는 마이크로초를 잘라내기 때문에 isoformat()을 그대로 쓴다.
+        values = [
+            value.isoformat() if hasattr(value, "isoformat") else value
+            for value in values
+        ]
+        payload = json.dumps(values, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        try:
+            padding = "=" * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            return [
+                self.get_field(name).to_python(value)
+                for name, value in zip(self.ordering, values)
+            ]
+        except (binascii.Error, UnicodeDecodeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_field(self, name):
+        name = self.field_name(name)
+        if name == "pk":
+            return self.model._meta.pk
+        return self.model._meta.get_field(name)
+
+
+class RankedPagination(KeysetPagination):
+
+    """Keyset pagination over (score, pk) pairs already ranked in Python
+
+    Used when the ordering cannot be expressed in SQL (e.g. a distance
+    computed outside the database). The cursor is the last (score, pk) pair,
+    so the next page starts right after it with a binary search.
+    """
+
+    def __init__(self, page_size=None):
+        super().__init__(ordering=("score", "pk"), page_size=page_size)
+
+    def paginate_ranked(self, ranked, queryset, request):
+        self.request = request
+        start = 0
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            start = bisect.bisect_right(ranked, tuple(self.decode_cursor(cursor)))
+
+        keys = ranked[start : start + self.page_size + 1]
+        self.has_next = len(keys) > self.page_size
+        objects = queryset.in_bulk([pk for score, pk in keys[: self.page_size]])
+        # 순위를 매긴 뒤에 지워진 행은 건너뛴다.
+        self.keys = [
+            (score, pk) for score, pk in keys[: self.page_size] if pk in objects
+        ]
+        self.page = [objects[pk] for score, pk in self.keys]
+        self.last_key = keys[min(len(keys), self.page_size) - 1] if keys else None
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(list(self.last_key))
+        )
+
+    def decode_cursor(self, cursor):
+        try:
+            padding = "=" * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+            score, pk = values
+            return float(score), int(pk)
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
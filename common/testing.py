@@ -0,0 +1,48 @@
+from django.test import override_settings
+from rooms.models import Room
+
+
+class NPlusOneTestMixin:
+
+    """Fail a test when one of its requests runs the same query shape too often
+
+    Mix into an APITestCase. Only the requests made with the test client are
+    checked, so the rows created in setUp() do not count.
+    """
+
+    nplusone_threshold = 3
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        detector = override_settings(
+            NPLUSONE_THRESHOLD=cls.nplusone_threshold, NPLUSONE_RAISE=True
+        )
+        detector.enable()
+        cls.addClassCleanup(detector.disable)
+
+
+def build_room(owner, **fields):
+    """An unsaved Room with every required field filled in (for bulk_create)
+
+    Pass any field to override the defaults.
+    """
+
+    return Room(
+        **{
+            "name": "Room",
+            "price": 1000,
+            "rooms": 1,
+            "toilets": 1,
+            "address": "123",
+            "kind": Room.RooomKindChoices.ENTIRE_PLACE,
+            "owner": owner,
+            **fields,
+        }
+    )
+
+
+def create_room(owner, **fields):
+    room = build_room(owner, **fields)
+    room.save()
+    return room
@@ -1,3 +1,251 @@
-from django.test import TestCase
+import csv
+import gzip
+import io
+import json
+import os
+import re
+import tempfile
+from unittest import mock
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from bookings.models import Booking
+from reviews.models import Review
+from experiences.models import Experience
+from rooms.models import Room
+from users.models import User
+from medias.models import Photo
+from rooms.serializers import RoomListSerializer
+from .metrics import REGISTRY
+from .nplusone import NPlusOneError
+from .testing import NPlusOneTestMixin, create_room
 
-# Create your tests here.
+
+class TestQueryPlans(TestCase):
+
+    """The hot lookups should be answered from an index, not a full table scan"""
+
+    def assertUsesIndex(self, queryset, fields=None):
+        plan = queryset.explain()
+        table = queryset.model._meta.db_table
+        if connection.vendor == "sqlite":
+            # SQLite는 인덱스를 못 쓰면 "SCAN 테이블" 만 출력한다.
+            self.assertNotRegex(plan, re.compile(rf"SCAN {table}$", re.MULTILINE))
+            if fields:
+                # 외래키의 단일 인덱스가 아니라 Meta.indexes의 복합 인덱스를 타는지까지 확인한다.
+                index = next(
+                    index
+                    for index in queryset.model._meta.indexes
+                    if index.fields == fields
+                )
+                self.assertIn(index.name, plan)
+        elif connection.vendor == "postgresql":
+            self.assertNotIn(f"Seq Scan on {table}", plan)
+
+    def test_room_bookings(self):
+        self.assertUsesIndex(
+            Booking.objects.filter(
+                room=1,
+                kind=Booking.BookingKindChoices.ROOM,
+                check_in__gt=timezone.now().date(),
+            ),
+            ["room", "kind", "check_in"],
+        )
+
+    def test_experience_bookings(self):
+        self.assertUsesIndex(
+            Booking.objects.filter(
+                experience=1,
+                kind=Booking.BookingKindChoices.EXPERIENCE,
+                experience_check_in__gt=timezone.now(),
+            ),
+            ["experience", "kind", "experience_check_in"],
+        )
+
+    def test_latest_reviews(self):
+        self.assertUsesIndex(
+            Review.objects.filter(room=1).order_by("-created_at"),
+            ["room", "created_at"],
+        )
+        self.assertUsesIndex(
+            Review.objects.filter(experience=1).order_by("-created_at"),
+            ["experience", "created_at"],
+        )
+
+    def test_rooms_by_city(self):
+        self.assertUsesIndex(
+            Room.objects.filter(city="서울").order_by("price"),
+            ["city", "price"],
+        )
+
+    def test_rooms_by_category(self):
+        self.assertUsesIndex(
+            Room.objects.filter(category=1, kind=Room.RooomKindChoices.ENTIRE_PLACE),
+            ["category", "kind"],
+        )
+
+    def test_room_list(self):
+        self.assertUsesIndex(
+            Room.objects.order_by("-created_at", "-pk"),
+            ["created_at", "id"],
+        )
+
+    def test_sorted_lists(self):
+        for model in (Room, Experience):
+            self.assertUsesIndex(
+                model.objects.filter(price__gte=1000, price__lte=5000).order_by(
+                    "price", "pk"
+                ),
+                ["price", "id"],
+            )
+            self.assertUsesIndex(
+                model.objects.order_by("-rating_average", "-pk"),
+                ["rating_average", "id"],
+            )
+
+
+class TestExport(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create(username="admin", is_staff=True)
+        self.user = User.objects.create(username="user")
+        for index in range(3):
+            room = create_room(self.user, name=f"방 {index}", address='123, "quoted"')
+            Review.objects.create(
+                user=self.user, room=room, payload="Good", rating=index + 1
+            )
+
+    def download(self, url):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content)
+
+    def test_ndjson(self):
+        content = self.download("/api/v1/exports/rooms")
+        rows = [json.loads(line) for line in content.decode().splitlines()]
+        self.assertEqual([row["name"] for row in rows], ["방 0", "방 1", "방 2"])
+        self.assertEqual(rows[0]["owner_id"], self.user.pk)
+
+    def test_csv_gzip(self):
+        content = self.download("/api/v1/exports/reviews?type=csv&gzip=1")
+        rows = list(csv.DictReader(io.StringIO(gzip.decompress(content).decode())))
+        self.assertEqual([row["rating"] for row in rows], ["1", "2", "3"])
+
+    def test_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "rooms.csv")
+            call_command("export_data", "rooms", type="csv", output=path)
+            with open(path, newline="") as file:
+                rows = list(csv.DictReader(file))
+        self.assertEqual(rows[1]["address"], '123, "quoted"')
+
+    def test_admin_only(self):
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get("/api/v1/exports/rooms").status_code, 403)
+        self.client.force_authenticate(self.admin)
+        self.assertEqual(self.client.get("/api/v1/exports/users").status_code, 404)
+        self.assertEqual(
+            self.client.get("/api/v1/exports/rooms?type=xml").status_code, 400
+        )
+
+
+@override_settings(REQUEST_METRICS=True)
+class TestRequestMetrics(APITestCase):
+    def setUp(self):
+        REGISTRY.clear()
+        self.admin = User.objects.create(username="admin", is_staff=True)
+
+    def test_server_timing(self):
+        response = self.client.get("/api/v1/rooms/")
+        self.assertRegex(
+            response["Server-Timing"], r'^db;dur=[\d.]+;desc="1 queries", app;dur='
+        )
+
+        summary = REGISTRY.get(
+            "http_request_db_queries", view="rooms.views.Rooms", method="GET"
+        )
+        self.assertEqual(summary.count, 1)
+        self.assertEqual(summary.sum, 1)
+
+    def test_metrics_endpoint(self):
+        for _ in range(3):
+            self.client.get("/api/v1/rooms/")
+        self.client.force_authenticate(self.admin)
+        response = self.client.get("/api/v1/_metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(
+            response["Content-Type"].startswith("text/plain; version=0.0.4")
+        )
+        body = response.content.decode()
+        self.assertIn("# TYPE http_request_duration_seconds summary", body)
+        self.assertIn(
+            "http_request_db_queries"
+            '{method="GET",view="rooms.views.Rooms",quantile="0.99"} 1',
+            body,
+        )
+        self.assertIn(
+            "http_request_duration_seconds_count"
+            '{method="GET",view="rooms.views.Rooms"} 3',
+            body,
+        )
+
+    def test_admin_only(self):
+        response = self.client.get("/api/v1/_metrics")
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(REQUEST_METRICS=False)
+    def test_disabled(self):
+        response = self.client.get("/api/v1/rooms/")
+        self.assertFalse(response.has_header("Server-Timing"))
+        self.assertIsNone(
+            REGISTRY.get(
+                "http_request_db_queries", view="rooms.views.Rooms", method="GET"
+            )
+        )
+
+
+class TestNPlusOneDetector(NPlusOneTestMixin, APITestCase):
+    def setUp(self):
+        user = User.objects.create(username="test")
+        for index in range(5):
+            room = create_room(user, name=f"Room {index}")
+            Photo.objects.create(
+                file="https://example.com/photo.jpg", description="Photo", room=room
+            )
+
+    def without_prefetch(self):
+        # 사진을 미리 불러오지 않으면 방마다 사진 쿼리가 한 번씩 실행된다.
+        return mock.patch.object(
+            RoomListSerializer,
+            "setup_eager_loading",
+            staticmethod(lambda queryset: queryset),
+        )
+
+    def test_prefetched_list_passes(self):
+        self.assertEqual(self.client.get("/api/v1/rooms/").status_code, 200)
+
+    def test_raises_with_stack(self):
+        with self.without_prefetch(), self.assertRaises(NPlusOneError) as context:
+            with self.assertLogs("common.nplusone", "WARNING") as logs:
+                with CaptureQueriesContext(connection) as queries:
+                    self.client.get("/api/v1/rooms/")
+        message = str(context.exception)
+        self.assertIn("medias_photo", message)
+        self.assertIn(os.path.join("rooms", "views.py"), message)
+        # 에러 리포트를 만들면서 QuerySet을 다시 실행하지 않으므로 경고는 한 번뿐이다.
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("GET /api/v1/rooms/", logs.output[0])
+        self.assertIn('FROM "medias_photo"', logs.output[0])
+        self.assertFalse(any("LIMIT 21" in query["sql"] for query in queries))
+
+    @override_settings(NPLUSONE_RAISE=False)
+    def test_warns(self):
+        with self.without_prefetch(), self.assertLogs(
+            "common.nplusone", "WARNING"
+        ) as logs:
+            response = self.client.get("/api/v1/rooms/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("GET /api/v1/rooms/", logs.output[0])
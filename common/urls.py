@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path("exports/<str:name>", views.Export.as_view()),
+    path("_metrics", views.Metrics.as_view()),
+]
@@ -1,3 +1,44 @@
-from django.shortcuts import render
+from django.http import HttpResponse, StreamingHttpResponse
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
+from .exports import DATASETS, TYPES, export
+from .metrics import REGISTRY
 
-# Create your views here.
+CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+class Export(APIView):
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, name):
+        if name not in DATASETS:
+            raise NotFound
+        # format은 DRF가 renderer를 고르는 데 쓰기 때문에 type이라는 이름을 사용한다.
+        export_type = request.query_params.get("type", "ndjson")
+        if export_type not in TYPES:
+            raise ParseError(f"type should be one of {', '.join(TYPES)}")
+        gzip = request.query_params.get("gzip") in ("1", "true")
+
+        filename = f"{name}.{export_type}" + (".gz" if gzip else "")
+        response = StreamingHttpResponse(
+            export(name, export_type, gzip),
+            content_type="application/gzip" if gzip else CONTENT_TYPES[export_type],
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class Metrics(APIView):
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return HttpResponse(
+            REGISTRY.render(),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
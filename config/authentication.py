@@ -1,8 +1,16 @@
-import jwt
+import time
 from django.conf import settings
-from rest_framework.authentication import BaseAuthentication
+from django.db import router
+from rest_framework.authentication import (
+    BaseAuthentication,
+    SessionAuthentication,
+    TokenAuthentication,
+)
 from rest_framework.exceptions import AuthenticationFailed
-from users.models import User
+from common.metrics import REGISTRY
+from users import tokens
+from rest_framework.authtoken.models import Token
+from users.cache import get_token, get_user, get_user_by_username
 
 
 class TrustMeBroAuthentication(BaseAuthentication):
@@ -10,29 +18,111 @@ class TrustMeBroAuthentication(BaseAuthentication):
         username = request.headers.get("Trust-me")
         if not username:
             return None
-        try:
-            user = User.objects.get(username=username)
-            # 유저가 유저와 논을 반환하는게 이생해보이지만 그게 규칙이다. user가 앞에오는 user,None 튜플을 반환해야함.
-            return (user, None)
-        except User.DoesNotExist:
+        user = get_user_by_username(username)
+        if user is None:
             raise AuthenticationFailed(f"No user{username}")
+        # 유저가 유저와 논을 반환하는게 이생해보이지만 그게 규칙이다. user가 앞에오는 user,None 튜플을 반환해야함.
+        return (user, None)
 
 
 class JWTAuthentication(BaseAuthentication):
+
+    """Access token check
+
+    The signature and the denylist prove the token; the user comes from
+    users.cache so a view that saves request.user writes current values.
+    The token's claims stay available read-only as request.auth.
+    """
+
     def authenticate(self, request):
         token = request.headers.get("Jwt")
         if not token:
             return None
-        decoded = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=["HS256"],
-        )
-        pk = decoded.get("pk")
-        if not pk:
-            raise AuthenticationFailed("Invalid Toke")
         try:
-            user = User.objects.get(pk=pk)
-            return (user, None)
-        except User.DoesNotExist:
+            claims = tokens.decode(token, tokens.ACCESS)
+        except tokens.InvalidToken as error:
+            raise AuthenticationFailed(str(error))
+        user = get_user(claims["pk"])
+        if user is None:
             raise AuthenticationFailed("User Not Found")
+        if not user.is_active:
+            raise AuthenticationFailed("User inactive or deleted.")
+        return (user, claims)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+
+    """TokenAuthentication that resolves the key and its user through users.cache"""
+
+    def authenticate_credentials(self, key):
+        values = get_token(key)
+        user = get_user(values[0]) if values else None
+        if user is None:
+            raise AuthenticationFailed("Invalid token.")
+        if not user.is_active:
+            raise AuthenticationFailed("User inactive or deleted.")
+        user_pk, created = values
+        return (
+            user,
+            Token.from_db(
+                router.db_for_read(Token),
+                ["key", "user_id", "created"],
+                [key, user_pk, created],
+            ),
+        )
+
+
+def has_session(request):
+    return settings.SESSION_COOKIE_NAME in request.COOKIES
+
+
+def has_trust_me(request):
+    return "Trust-me" in request.headers
+
+
+def has_token(request):
+    return request.headers.get("Authorization", "").split(" ")[0].lower() == "token"
+
+
+def has_jwt(request):
+    return "Jwt" in request.headers
+
+
+class DispatchingAuthentication(BaseAuthentication):
+
+    """Run only the authenticators whose credentials are in the request
+
+    The headers are looked at once and the matching backends are tried in
+    the same priority order DRF used to walk them all in, so the result is
+    the same while an anonymous or JWT request no longer pays for the
+    session, Trust-me and token lookups.
+    """
+
+    backends = (
+        ("session", SessionAuthentication(), has_session),
+        ("trust_me", TrustMeBroAuthentication(), has_trust_me),
+        ("token", CachedTokenAuthentication(), has_token),
+        ("jwt", JWTAuthentication(), has_jwt),
+    )
+
+    def authenticate(self, request):
+        for name, backend, matches in self.backends:
+            if not matches(request):
+                continue
+            started = time.perf_counter()
+            try:
+                result = backend.authenticate(request)
+            finally:
+                REGISTRY.observe(
+                    "auth_backend_duration_seconds",
+                    "Time spent in each authentication backend",
+                    {"backend": name},
+                    time.perf_counter() - started,
+                )
+            if result is not None:
+                return result
+        return None
+
+    def authenticate_header(self, request):
+        # 예전처럼 첫 번째였던 SessionAuthentication을 따라 401 대신 403을 응답한다.
+        return None
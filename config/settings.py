@@ -56,6 +56,7 @@ CUSTOM_APPS = [
     "bookings.apps.BookingsConfig",
     "medias.apps.MediasConfig",
     "direct_messages.apps.DirectMessagesConfig",
+    "search.apps.SearchConfig",
 ]
 
 SYSTEM_APPS = [
@@ -70,6 +71,9 @@ SYSTEM_APPS = [
 INSTALLED_APPS = SYSTEM_APPS + THIRD_PARTY_APPS + CUSTOM_APPS
 
 MIDDLEWARE = [
+    # REQUEST_METRICS가 꺼져 있으면 스스로 빠진다.
+    "common.middleware.RequestMetricsMiddleware",
+    "common.middleware.NPlusOneMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -112,9 +116,39 @@ DATABASES = {
 }
 
 
+# Cache
+# CACHE_URL로 백엔드를 바꿀 수 있다. (예: redis://127.0.0.1:6379/1, filecache:///tmp/airbnb)
+
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://"),
+}
+
+# 방/체험 상세 응답을 캐시에 보관하는 시간(초)
+DETAIL_CACHE_TIMEOUT = 60 * 10
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
+# 비밀번호 해시. 첫 번째로 새 비밀번호를 저장하고, 나머지는 예전 해시를 확인할 때만 쓴다.
+# "argon2"는 argon2-cffi 패키지가 설치되어 있어야 한다.
+PASSWORD_HASHER = env("PASSWORD_HASHER", default="scrypt")
+HASHERS = {
+    "scrypt": "users.hashers.ScryptPasswordHasher",
+    "argon2": "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "pbkdf2": "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+}
+PASSWORD_HASHERS = (
+    [HASHERS[PASSWORD_HASHER]]
+    + [hasher for name, hasher in HASHERS.items() if name != PASSWORD_HASHER]
+    + ["django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher"]
+)
+# scrypt 비용. 높을수록 안전하지만 로그인이 느려진다. (n = work factor, r = block size)
+SCRYPT_WORK_FACTOR = env.int("SCRYPT_WORK_FACTOR", default=2**14)
+SCRYPT_BLOCK_SIZE = env.int("SCRYPT_BLOCK_SIZE", default=8)
+# 로그인 때 예전 해시를 새 해시로 바꾸는 작업을 요청 스레드 밖에서 한다. (JWT 로그인만, 세션 로그인은 요청 안에서)
+PASSWORD_REHASH_ASYNC = env.bool("PASSWORD_REHASH_ASYNC", default=True)
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -164,12 +198,49 @@ MEDIA_URL = "user-uploads/"
 
 PAGE_SIZE = 5
 
+# 검색 인덱스: "auto"는 SQLite면 FTS5, 그 외의 DB는 SearchTerm 테이블을 사용한다. ("fts5", "terms")
+SEARCH_BACKEND = env("SEARCH_BACKEND", default="auto")
+
+# 주변 검색에서 거리순으로 남기는 최대 방 개수(facet 쿼리의 pk 목록 크기이기도 하다)와
+# 다음 페이지를 위해 그 순위를 캐시에 두는 시간(초)
+NEARBY_MAX_RESULTS = 1000
+NEARBY_CACHE_TIMEOUT = 60
+
+# 방 상세에 함께 보여주는 최신 리뷰 개수
+REVIEW_PREVIEW_SIZE = 3
+
+# 동시에 같은 방을 예약하다 DB 잠금 오류가 나면 다시 시도하는 횟수와 첫 대기 시간(초)
+BOOKING_RETRIES = 3
+BOOKING_RETRY_DELAY = 0.05
+
+# 인증된 유저를 프로세스 안의 LRU에 잠시 보관해서 요청마다 유저를 조회하지 않는다.
+# USER_CACHE_SHARED를 켜면 CACHES의 공용 캐시도 함께 사용해서 여러 프로세스가 나눠 쓴다.
+USER_CACHE_SIZE = 1024
+USER_CACHE_TTL = 30
+USER_CACHE_SHARED = env.bool("USER_CACHE_SHARED", default=False)
+
+# JWT 유효 시간(초). access는 짧게, refresh로 새 access를 받는다.
+JWT_ACCESS_LIFETIME = 15 * 60
+JWT_REFRESH_LIFETIME = 14 * 24 * 60 * 60
+# 다른 프로세스에서 폐기한 토큰이 있는지 DB를 확인하는 간격(초). 그 사이에는 Bloom filter만 본다.
+JWT_DENYLIST_CHECK_INTERVAL = 5
+
+# 요청마다 처리 시간과 쿼리 수를 기록해서 Server-Timing 헤더와 /api/v1/_metrics 로 보여준다.
+REQUEST_METRICS = env.bool("REQUEST_METRICS", default=False)
+
+# 한 요청에서 같은 모양의 쿼리가 이 횟수보다 많이 실행되면 N+1로 보고 경고한다. (None이면 끈다)
+NPLUSONE_THRESHOLD = env.int("NPLUSONE_THRESHOLD", default=None)
+# 경고 대신 NPlusOneError를 발생시킨다. (테스트용)
+NPLUSONE_RAISE = env.bool("NPLUSONE_RAISE", default=False)
+# N+1 검사가 켜져 있을 때 이 시간(ms)보다 오래 걸린 쿼리도 기록한다.
+SLOW_QUERY_MS = env.int("SLOW_QUERY_MS", default=None)
+# 에러 리포트가 지역 변수의 QuerySet을 repr하면서 쿼리를 다시 실행하지 않고 SQL만 보여준다.
+DEFAULT_EXCEPTION_REPORTER_FILTER = "common.nplusone.QuerySetReporterFilter"
+
 REST_FRAMEWORK = {
+    # 세션, Trust-me, Token, Jwt 중 요청에 있는 것만 이 순서대로 확인한다.
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.SessionAuthentication",
-        "config.authentication.TrustMeBroAuthentication",
-        "rest_framework.authentication.TokenAuthentication",
-        "config.authentication.JWTAuthentication",
+        "config.authentication.DispatchingAuthentication",
     ]
 }
 
@@ -26,4 +26,6 @@ urlpatterns = [
     path("api/v1/medias/", include("medias.urls")),
     path("api/v1/wishlists/", include("wishlists.urls")),
     path("api/v1/users/", include("users.urls")),
+    path("api/v1/search", include("search.urls")),
+    path("api/v1/", include("common.urls")),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
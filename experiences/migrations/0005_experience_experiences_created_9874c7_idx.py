@@ -0,0 +1,19 @@
+# Generated by Django 4.1.6 on 2026-10-18 15:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("experiences", "0004_alter_perk_options"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="experience",
+            index=models.Index(
+                fields=["created_at", "id"], name="experiences_created_9874c7_idx"
+            ),
+        ),
+    ]
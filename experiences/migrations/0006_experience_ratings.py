@@ -0,0 +1,59 @@
+# Generated by Django 4.1.6 on 2026-10-18 16:02
+
+from django.db import migrations, models
+from django.db.models import Count, FloatField, OuterRef, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+
+def fill_ratings(apps, schema_editor):
+    Experience = apps.get_model("experiences", "Experience")
+    Review = apps.get_model("reviews", "Review")
+    reviews = (
+        Review.objects.filter(experience=OuterRef("pk")).order_by().values("experience")
+    )
+    count = Coalesce(Subquery(reviews.annotate(count=Count("pk")).values("count")), 0)
+    total = Coalesce(Subquery(reviews.annotate(total=Sum("rating")).values("total")), 0)
+    Experience.objects.update(
+        rating_count=count,
+        rating_total=total,
+        rating_average=Coalesce(Cast(total, FloatField()) / NullIf(count, 0), 0.0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("experiences", "0005_experience_experiences_created_9874c7_idx"),
+        ("reviews", "0003_review_reviews_rev_room_id_60a6db_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="experience",
+            name="rating_average",
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="experience",
+            name="rating_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="experience",
+            name="rating_total",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="experience",
+            index=models.Index(
+                fields=["price", "id"], name="experiences_price_c255fa_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="experience",
+            index=models.Index(
+                fields=["rating_average", "id"], name="experiences_rating__073c7c_idx"
+            ),
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,8 @@
 from django.db import models
-from common.models import CommonModel
+from common.models import CommonModel, DenormalizedFieldsMixin
 
 
-class Experience(CommonModel):
+class Experience(DenormalizedFieldsMixin, CommonModel):
 
     """Experience Model Definition"""
 
@@ -32,20 +32,29 @@ class Experience(CommonModel):
         related_name="experiences",
     )
 
+    # 리뷰가 생성/수정/삭제될 때마다 reviews.signals에서 갱신된다.
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_total = models.PositiveIntegerField(default=0, editable=False)
+    rating_average = models.FloatField(default=0, editable=False)
+    # 평점 필드는 F()로만 바꾸고, save()로는 덮어쓰지 않는다.
+    denormalized_fields = ("rating_count", "rating_total", "rating_average")
+
     def rating(experience):
-        count = experience.reviews.count()
-        if count == 0:
+        if experience.rating_count == 0:
             return 0
-        else:
-            total_rating = 0
-            for review in experience.reviews.all().value("rating"):
-                total_rating += review["rating"]
-            return round(total_rating / count, 2)
+        return round(experience.rating_total / experience.rating_count, 2)
 
     # 카테고리가 삭제되더라도 카스케이드하지 않고 비워둠.
     def __str__(self) -> str:
         return self.name
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"]),
+            models.Index(fields=["price", "id"]),
+            models.Index(fields=["rating_average", "id"]),
+        ]
+
 
 class Perk(CommonModel):
 
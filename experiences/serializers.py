@@ -3,7 +3,7 @@ from medias.serializers import PhotoSerializer
 from .models import Perk, Experience
 from users.serializers import TinyUserSerializer
 from categories.serializers import CategorySerializer
-from wishlists.models import Wishlist
+from wishlists.liked import get_liked
 
 
 class PerkSerializer(serializers.ModelSerializer):
@@ -16,6 +16,7 @@ class ExperienceListSerializer(serializers.ModelSerializer):
 
     rating = serializers.SerializerMethodField()
     is_host = serializers.SerializerMethodField()
+    is_liked = serializers.SerializerMethodField()
     photos = PhotoSerializer(many=True, read_only=True)
 
     class Meta:
@@ -29,6 +30,7 @@ class ExperienceListSerializer(serializers.ModelSerializer):
             "price",
             "rating",
             "is_host",
+            "is_liked",
             "photos",
         )
 
@@ -36,8 +38,13 @@ class ExperienceListSerializer(serializers.ModelSerializer):
         return experience.rating()
 
     def get_is_host(self, experience):
-        request = self.context["request"]
-        return experience.host == request.user
+        request = self.context.get("request")
+        if request:
+            return experience.host_id == request.user.pk
+        return False
+
+    def get_is_liked(self, experience):
+        return experience.pk in get_liked(self.context.get("request")).experiences
 
 
 class ExperienceDetailSerializer(serializers.ModelSerializer):
@@ -57,9 +64,10 @@ class ExperienceDetailSerializer(serializers.ModelSerializer):
         return experience.rating()
 
     def get_is_host(self, experience):
-        request = self.context["request"]
-        return experience.host == request.user
+        request = self.context.get("request")
+        if request:
+            return experience.host_id == request.user.pk
+        return False
 
     def get_is_liked(self, experience):
-        request = self.context["request"]
-        return Wishlist.objects.filter(user=request.user, experiences__id=experience.pk).exists()
+        return experience.pk in get_liked(self.context.get("request")).experiences
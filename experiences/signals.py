@@ -0,0 +1,32 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from common.cache import invalidate_detail
+from .models import Experience, Perk
+
+
+@receiver(post_save, sender=Experience)
+@receiver(post_delete, sender=Experience)
+def invalidate_experience(sender, instance, **kwargs):
+    invalidate_detail("experience", instance.pk)
+
+
+@receiver(m2m_changed, sender=Experience.perks.through)
+def invalidate_experience_perks(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        invalidate_detail("experience", instance.pk)
+        return
+    experience_pks = pk_set or instance.experiences.values_list("pk", flat=True)
+    for experience_pk in experience_pks:
+        invalidate_detail("experience", experience_pk)
+
+
+@receiver(post_save, sender=Perk)
+@receiver(pre_delete, sender=Perk)
+def invalidate_perk_experiences(sender, instance, **kwargs):
+    experience_pks = Experience.perks.through.objects.filter(
+        perk=instance.pk
+    ).values_list("experience", flat=True)
+    for experience_pk in experience_pks:
+        invalidate_detail("experience", experience_pk)
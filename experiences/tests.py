@@ -1,3 +1,141 @@
-from django.test import TestCase
+from rest_framework.test import APITestCase
+from categories.models import Category
+from users.models import User
+from .models import Experience, Perk
 
-# Create your tests here.
+
+class TestExperiencePerks(APITestCase):
+    URL = "/api/v1/experiences/"
+
+    def setUp(self):
+        self.user = User.objects.create(username="test")
+        self.category = Category.objects.create(
+            name="Experiences",
+            kind=Category.CategoryKindChoices.EXPERIENCES,
+        )
+        self.perks = Perk.objects.bulk_create(
+            [Perk(name=f"Perk {index}") for index in range(6)]
+        )
+        self.client.force_authenticate(self.user)
+
+    def create_experience(self, perks):
+        response = self.client.post(
+            self.URL,
+            {
+                "name": "Experience",
+                "price": 1000,
+                "address": "123",
+                "start": "10:00",
+                "end": "12:00",
+                "description": "Experience",
+                "category": self.category.pk,
+                "perks": [perk.pk for perk in perks],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        return Experience.objects.get(pk=response.json()["id"])
+
+    def through_rows(self, experience):
+        return dict(
+            Experience.perks.through.objects.filter(experience=experience).values_list(
+                "perk_id", "id"
+            )
+        )
+
+    def test_create_with_perks(self):
+        experience = self.create_experience(self.perks[:3])
+        self.assertEqual(
+            set(self.through_rows(experience)), {perk.pk for perk in self.perks[:3]}
+        )
+
+    def test_update_only_changes_diff(self):
+        experience = self.create_experience(self.perks[:3])
+        before = self.through_rows(experience)
+
+        response = self.client.put(
+            f"{self.URL}{experience.pk}",
+            {"perks": [perk.pk for perk in self.perks[1:5]]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        after = self.through_rows(experience)
+
+        self.assertEqual(set(after), {perk.pk for perk in self.perks[1:5]})
+        # 남아 있는 perk의 through row는 지워졌다가 다시 만들어지지 않는다.
+        for perk in self.perks[1:3]:
+            self.assertEqual(after[perk.pk], before[perk.pk])
+
+    def test_missing_perks(self):
+        response = self.client.post(
+            self.URL,
+            {
+                "name": "Experience",
+                "price": 1000,
+                "address": "123",
+                "start": "10:00",
+                "end": "12:00",
+                "description": "Experience",
+                "category": self.category.pk,
+                "perks": [self.perks[0].pk, 9999],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["detail"], "Perk not found: 9999")
+        self.assertFalse(Experience.objects.exists())
+
+
+class TestExperiencesSort(APITestCase):
+    URL = "/api/v1/experiences/"
+
+    def setUp(self):
+        user = User.objects.create(username="test")
+        Experience.objects.bulk_create(
+            [
+                Experience(
+                    name=f"Experience {index}",
+                    host=user,
+                    price=1000 * (index % 3 + 1),
+                    address="123",
+                    start="10:00",
+                    end="12:00",
+                    description="Experience",
+                    rating_average=index % 4,
+                )
+                for index in range(8)
+            ]
+        )
+
+    def walk(self, params):
+        seen = []
+        url = self.URL
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            seen += [experience["pk"] for experience in data["results"]]
+            url, params = data["next"], None
+        return seen
+
+    def test_sort(self):
+        expected = list(
+            Experience.objects.order_by("-price", "-pk").values_list("pk", flat=True)
+        )
+        self.assertEqual(self.walk({"sort": "-price"}), expected)
+        expected = list(
+            Experience.objects.order_by("-rating_average", "-pk").values_list(
+                "pk", flat=True
+            )
+        )
+        self.assertEqual(self.walk({"sort": "rating"}), expected)
+
+    def test_price_range(self):
+        expected = list(
+            Experience.objects.filter(price__lte=2000)
+            .order_by("price", "pk")
+            .values_list("pk", flat=True)
+        )
+        self.assertEqual(self.walk({"sort": "price", "max_price": 2000}), expected)
+        response = self.client.get(self.URL, {"min_price": 3000, "max_price": 1000})
+        self.assertEqual(response.status_code, 400)
@@ -17,19 +17,31 @@ from bookings.serializers import (
     CreateRoomBookingSerializer,
     CreateExperienceBookingSerializer,
 )
+from common.cache import get_cached_detail
+from common.filters import SORTS, ListingFilterSerializer, filter_price
+from common.m2m import fetch_related
+from common.pagination import KeysetPagination
 
 
 class Experiences(APIView):
     permission_classes = [IsAuthenticatedOrReadOnly]
 
     def get(self, request):
-        all_experiences = Experience.objects.all()
+        filters = ListingFilterSerializer(data=request.query_params)
+        filters.is_valid(raise_exception=True)
+        paginator = KeysetPagination(ordering=SORTS[filters.validated_data["sort"]])
+        experiences = paginator.paginate_queryset(
+            filter_price(
+                Experience.objects.all(), filters.validated_data
+            ).prefetch_related("photos"),
+            request,
+        )
         serializer = serializers.ExperienceListSerializer(
-            all_experiences,
+            experiences,
             many=True,
             context={"request": request},
         )
-        return Response(serializer.data)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
 
@@ -47,19 +59,16 @@ class Experiences(APIView):
             except Category.DoesNotExist:
                 raise ParseError("Category not found")
 
+            perks = fetch_related(Perk, perk_pks) if perk_pks else []
+
             try:
                 with transaction.atomic():
                     new_experience = serializer.save(
                         host=request.user,
                         category=category,
                     )
-                    if perk_pks:
-                        for perk_pk in perk_pks:
-                            perk = Perk.objects.get(pk=perk_pk)
-                            print(perk.name)
-                            new_experience.perks.add(perk)
-            except Perk.DoesNotExist:
-                raise ParseError("Perk not found")
+                    if perks:
+                        new_experience.perks.set(perks)
             except Exception as e:
                 raise ParseError(e)
             serializer = serializers.ExperienceDetailSerializer(
@@ -81,11 +90,22 @@ class ExperienceDetail(APIView):
 
     def get(self, request, pk):
         experience = self.get_object(pk)
+        data = get_cached_detail(
+            "experience",
+            experience.pk,
+            lambda: serializers.ExperienceDetailSerializer(experience).data,
+        )
         serializer = serializers.ExperienceDetailSerializer(
             experience,
             context={"request": request},
         )
-        return Response(serializer.data)
+        return Response(
+            {
+                **data,
+                "is_host": serializer.get_is_host(experience),
+                "is_liked": serializer.get_is_liked(experience),
+            }
+        )
 
     def delete(self, request, pk):
         experience = self.get_object(pk)
@@ -112,19 +132,18 @@ class ExperienceDetail(APIView):
                         raise ParseError("The category kind should be 'experience'")
                 except Category.DoesNotExist:
                     ParseError("Category not found")
+            perk_pks = request.data.get("perks")
+            perks = fetch_related(Perk, perk_pks) if perk_pks else None
+
             try:
                 with transaction.atomic():
                     if category_pk:
                         updated_experience = serializer.save(category=category)
                     else:
                         updated_experience = serializer.save()
-                        perks = request.data.get("perks")
 
                     if perks:
-                        experience.perks.clear()
-                        for perk_pk in perks:
-                            perk = Perk.objects.get(pk=perk_pk)
-                            updated_experience.perks.add(perk)
+                        updated_experience.perks.set(perks)
                 serializer = serializers.ExperienceDetailSerializer(
                     updated_experience, context={"request": request}
                 )
@@ -199,7 +218,9 @@ class ExperienceReviews(APIView):
         end = start + page_size
         experience = self.get_object(pk)
         serializer = ReviewSerializer(
-            experience.reviews.all()[start:end],
+            experience.reviews.select_related("user").order_by("-created_at", "-pk")[
+                start:end
+            ],
             many=True,
         )
         return Response(serializer.data)
@@ -273,7 +294,7 @@ class ExperienceBookings(APIView):
         bookings = Booking.objects.filter(
             experience=experience,
             kind=Booking.BookingKindChoices.EXPERIENCE,
-            check_in__gt=now,
+            experience_check_in__gt=now,
         )
         serializer = PublicBookingSerializer(bookings, many=True)
         return Response(serializer.data)
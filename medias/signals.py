@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from common.cache import invalidate_detail
+from .models import Photo
+
+
+@receiver(post_save, sender=Photo)
+@receiver(post_delete, sender=Photo)
+def invalidate_photo_owner(sender, instance, **kwargs):
+    invalidate_detail("room", instance.room_id)
+    invalidate_detail("experience", instance.experience_id)
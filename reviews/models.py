@@ -34,3 +34,10 @@ class Review(CommonModel):
         return f"{self.user} / {self.rating}☆"
 
     # 유저와 별점을 반환하게끔 __str__을 설정한다.
+
+    class Meta:
+        indexes = [
+            # 방/체험의 리뷰를 최신순으로 읽는다.
+            models.Index(fields=["room", "created_at"]),
+            models.Index(fields=["experience", "created_at"]),
+        ]
@@ -0,0 +1,54 @@
+from django.db.models import Count, F, FloatField, OuterRef, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce, NullIf
+from experiences.models import Experience
+from rooms.models import Room
+from .models import Review
+
+# 리뷰의 어떤 필드가 어떤 모델을 가리키는지
+RATED = {
+    "room": Room,
+    "experience": Experience,
+}
+
+
+def average(count, total):
+    # 리뷰가 없으면 0으로 둔다.
+    return Coalesce(Cast(total, FloatField()) / NullIf(count, 0), 0.0)
+
+
+def apply_rating(model, pk, count, total):
+    """Shift the rating aggregate stored on a room or experience by the given deltas"""
+
+    if not pk or (count == 0 and total == 0):
+        return
+    # F()를 사용하면 파이썬이 아닌 데이터베이스에서 값을 더하기 때문에 동시에 저장되어도 안전하다.
+    rating_count = F("rating_count") + count
+    rating_total = F("rating_total") + total
+    model.objects.filter(pk=pk).update(
+        rating_count=rating_count,
+        rating_total=rating_total,
+        rating_average=average(rating_count, rating_total),
+    )
+
+
+def move_rating(model, previous_pk, previous_rating, pk, rating):
+    """Move a review's rating from where it was to where it is now"""
+
+    if previous_pk == pk:
+        apply_rating(model, pk, 0, rating - previous_rating)
+    else:
+        apply_rating(model, previous_pk, -1, -previous_rating)
+        apply_rating(model, pk, 1, rating)
+
+
+def rebuild_ratings(field, model):
+    """Recalculate the rating aggregate of every row of model from the reviews table"""
+
+    reviews = Review.objects.filter(**{field: OuterRef("pk")}).order_by().values(field)
+    count = Coalesce(Subquery(reviews.annotate(count=Count("pk")).values("count")), 0)
+    total = Coalesce(Subquery(reviews.annotate(total=Sum("rating")).values("total")), 0)
+    return model.objects.update(
+        rating_count=count,
+        rating_total=total,
+        rating_average=average(count, total),
+    )
@@ -0,0 +1,56 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from common.cache import invalidate_detail
+from experiences.models import Experience
+from rooms.models import Room
+from .models import Review
+from .ratings import RATED, apply_rating, move_rating
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_rating(sender, instance, **kwargs):
+    # 수정되는 리뷰라면 저장 전의 room, experience와 rating을 기억해둔다.
+    instance._previous_rating = None
+    if not instance._state.adding:
+        instance._previous_rating = (
+            Review.objects.filter(pk=instance.pk)
+            .values_list("room_id", "experience_id", "rating")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Review)
+def add_rating(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_rating", None)
+    if created or previous is None:
+        for field, model in RATED.items():
+            apply_rating(model, getattr(instance, f"{field}_id"), 1, instance.rating)
+        return
+    previous_room_pk, previous_experience_pk, previous_rating = previous
+    move_rating(
+        Room, previous_room_pk, previous_rating, instance.room_id, instance.rating
+    )
+    move_rating(
+        Experience,
+        previous_experience_pk,
+        previous_rating,
+        instance.experience_id,
+        instance.rating,
+    )
+
+
+@receiver(post_delete, sender=Review)
+def remove_rating(sender, instance, **kwargs):
+    for field, model in RATED.items():
+        apply_rating(model, getattr(instance, f"{field}_id"), -1, -instance.rating)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_reviewed(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_rating", None)
+    if previous:
+        invalidate_detail("room", previous[0])
+        invalidate_detail("experience", previous[1])
+    invalidate_detail("room", instance.room_id)
+    invalidate_detail("experience", instance.experience_id)
@@ -1,3 +1,110 @@
+import datetime
+from io import StringIO
+from django.core.management import call_command
 from django.test import TestCase
+from experiences.models import Experience
+from common.testing import create_room
+from rooms.models import Room
+from users.models import User
+from .models import Review
 
-# Create your tests here.
+
+class TestRoomRatingAggregate(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="test")
+        self.room = self.create_room("Room")
+
+    def create_room(self, name):
+        return create_room(self.user, name=name)
+
+    def create_review(self, rating, room=None):
+        return Review.objects.create(
+            user=self.user,
+            room=room or self.room,
+            payload="Review",
+            rating=rating,
+        )
+
+    def assertAggregate(self, room, count, total):
+        room.refresh_from_db()
+        self.assertEqual(room.rating_count, count)
+        self.assertEqual(room.rating_total, total)
+        self.assertAlmostEqual(room.rating_average, total / count if count else 0)
+
+    def test_create_review(self):
+        self.create_review(5)
+        self.create_review(2)
+        self.assertAggregate(self.room, 2, 7)
+        self.assertEqual(self.room.rating(), 3.5)
+
+    def test_update_review(self):
+        review = self.create_review(5)
+        review.rating = 1
+        review.save()
+        self.assertAggregate(self.room, 1, 1)
+
+        other_room = self.create_room("Other Room")
+        review.room = other_room
+        review.save()
+        self.assertAggregate(self.room, 0, 0)
+        self.assertAggregate(other_room, 1, 1)
+
+    def test_room_save_keeps_aggregate(self):
+        # 리뷰가 달리기 전에 불러온 방을 저장해도 평점이 예전 값으로 돌아가지 않는다.
+        stale = Room.objects.get(pk=self.room.pk)
+        self.create_review(5)
+        stale.name = "Renamed"
+        stale.save()
+        self.assertAggregate(self.room, 1, 5)
+        self.assertEqual(self.room.name, "Renamed")
+
+    def test_delete_review(self):
+        review = self.create_review(4)
+        self.create_review(2)
+        review.delete()
+        self.assertAggregate(self.room, 1, 2)
+
+    def test_rebuild_ratings(self):
+        self.create_review(4)
+        self.create_review(3)
+        Room.objects.update(rating_count=0, rating_total=0, rating_average=0)
+
+        call_command("rebuild_ratings", stdout=StringIO())
+        self.assertAggregate(self.room, 2, 7)
+
+    def test_experience(self):
+        experience = Experience.objects.create(
+            name="Tour",
+            host=self.user,
+            price=1000,
+            address="123",
+            start=datetime.time(9),
+            end=datetime.time(12),
+            description="Tour",
+        )
+        review = Review.objects.create(
+            user=self.user,
+            experience=experience,
+            payload="Review",
+            rating=5,
+        )
+        stale = Experience.objects.get(pk=experience.pk)
+        Review.objects.create(
+            user=self.user, experience=experience, payload="Review", rating=2
+        )
+        self.assertAggregate(experience, 2, 7)
+        self.assertEqual(experience.rating(), 3.5)
+        # 평점을 불러온 뒤에 저장해도 그 사이에 달린 리뷰가 사라지지 않는다.
+        stale.save()
+        self.assertAggregate(experience, 2, 7)
+
+        # 방으로 옮겨진 리뷰는 체험의 평점에서 빠진다.
+        review.experience = None
+        review.room = self.room
+        review.save()
+        self.assertAggregate(experience, 1, 2)
+        self.assertAggregate(self.room, 1, 5)
+
+        Experience.objects.update(rating_count=0, rating_total=0, rating_average=0)
+        call_command("rebuild_ratings", stdout=StringIO())
+        self.assertAggregate(experience, 1, 2)
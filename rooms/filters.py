@@ -0,0 +1,133 @@
+from django.db.models import CharField, Count, Q, Value
+from django.db.models.functions import Cast
+from rest_framework import serializers
+from bookings.availability import available_rooms
+from common.filters import ListingFilterSerializer, filter_price
+from . import geo
+from .models import Room
+
+# 방 목록에서 개수를 세어 보여주는 facet. (이름, 묶을 필드)
+FACETS = (
+    ("country", "country"),
+    ("city", "city"),
+    ("kind", "kind"),
+    ("pet_friendly", "pet_friendly"),
+    ("category", "category_id"),
+    ("amenities", "amenities__pk"),
+)
+
+
+class RoomFilterSerializer(ListingFilterSerializer):
+
+    """Query parameters accepted by the room list"""
+
+    check_in = serializers.DateField(required=False)
+    check_out = serializers.DateField(required=False)
+    guests = serializers.IntegerField(required=False, min_value=1)
+    country = serializers.CharField(required=False)
+    city = serializers.CharField(required=False)
+    kind = serializers.ChoiceField(
+        required=False, choices=Room.RooomKindChoices.choices
+    )
+    # 쿼리스트링에 없는 BooleanField는 False가 되기 때문에 default=None으로 "보내지 않음"을 구분한다.
+    pet_friendly = serializers.BooleanField(default=None, allow_null=True)
+    category = serializers.IntegerField(required=False)
+    # ?amenities=1&amenities=2 는 두 어메니티를 모두 가진 방만 찾는다.
+    amenities = serializers.ListField(child=serializers.IntegerField(), required=False)
+    # ?near=37.56,126.97&radius=5 는 반경 5km 안의 방을 가까운 순서로 보여준다.
+    near = serializers.CharField(required=False)
+    radius = serializers.FloatField(default=10, min_value=0.1, max_value=100)
+
+    def validate_near(self, value):
+        try:
+            latitude, longitude = (float(part) for part in value.split(","))
+        except ValueError:
+            raise serializers.ValidationError("near should be 'latitude,longitude'.")
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise serializers.ValidationError("near is out of range.")
+        return latitude, longitude
+
+    def validate(self, data):
+        data = super().validate(data)
+        check_in = data.get("check_in")
+        check_out = data.get("check_out")
+        if bool(check_in) != bool(check_out):
+            raise serializers.ValidationError(
+                "check_in and check_out should be sent together."
+            )
+        if check_in and check_out <= check_in:
+            raise serializers.ValidationError(
+                "Check in should be smaller than check out."
+            )
+        return data
+
+
+def parse_filters(params):
+    serializer = RoomFilterSerializer(data=params)
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data
+
+
+def filter_rooms(rooms, filters):
+    if "check_in" in filters:
+        # 해당 기간에 예약된 밤이 하나도 없는 방만 남긴다. (NOT EXISTS 한 번으로 끝난다)
+        rooms = available_rooms(filters["check_in"], filters["check_out"], rooms)
+    if "guests" in filters:
+        rooms = rooms.filter(
+            Q(max_guests__isnull=True) | Q(max_guests__gte=filters["guests"])
+        )
+    for name in ("country", "city", "kind"):
+        if name in filters:
+            rooms = rooms.filter(**{name: filters[name]})
+    if filters.get("pet_friendly") is not None:
+        rooms = rooms.filter(pet_friendly=filters["pet_friendly"])
+    if "category" in filters:
+        rooms = rooms.filter(category_id=filters["category"])
+    rooms = filter_price(rooms, filters)
+    if filters.get("amenities"):
+        amenity_pks = set(filters["amenities"])
+        # 조인으로 방이 중복되지 않도록, 모든 어메니티를 가진 방의 pk를 서브쿼리로 구한다.
+        rooms = rooms.filter(
+            pk__in=Room.amenities.through.objects.filter(amenity_id__in=amenity_pks)
+            .values("room_id")
+            .annotate(matched=Count("amenity_id"))
+            .filter(matched=len(amenity_pks))
+            .values("room_id")
+        )
+    if "near" in filters:
+        # 주변 geohash 셀에 있는 방만 남긴다. 정확한 거리는 geo.rank_by_distance에서 계산한다.
+        rooms = rooms.filter(geo.near(*filters["near"], filters["radius"]))
+    return rooms
+
+
+def facet_counts(rooms):
+    """Count the filtered rooms per value of every facet in one query
+
+    Each facet is a GROUP BY over the same filtered queryset and the groups
+    are glued together with UNION ALL, so the database does the counting in
+    a single round trip.
+    """
+
+    queries = [
+        rooms.order_by()
+        .filter(**{f"{field}__isnull": False})
+        .values(facet=Value(name), value=Cast(field, CharField()))
+        .annotate(count=Count("pk", distinct=True))
+        .values_list("facet", "value", "count")
+        for name, field in FACETS
+    ]
+    facets = {name: [] for name, field in FACETS}
+    for name, value, count in queries[0].union(*queries[1:], all=True):
+        facets[name].append({"value": facet_value(name, value), "count": count})
+    for values in facets.values():
+        values.sort(key=lambda facet: (-facet["count"], str(facet["value"])))
+    return facets
+
+
+def facet_value(name, value):
+    # Cast한 값은 문자열이므로 원래 타입으로 되돌린다. (SQLite는 boolean을 1/0으로 저장한다)
+    if name == "pet_friendly":
+        return value.lower() in ("1", "true", "t")
+    if name in ("category", "amenities"):
+        return int(value)
+    return value
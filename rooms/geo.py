@@ -0,0 +1,155 @@
+import heapq
+import math
+from django.db.models import Q
+
+try:
+    import numpy as np
+except ImportError:  # NumPy가 없으면 math로 한 건씩 계산한다.
+    np = None
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 9
+# 주변 검색에서 OR로 묶는 geohash 셀의 최대 개수
+MAX_CELLS = 16
+
+
+def encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Encode a point into a geohash string of the given length"""
+
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit, even = [], 0, 0, True
+    while len(chars) < precision:
+        value, span = (longitude, lng_range) if even else (latitude, lat_range)
+        middle = (span[0] + span[1]) / 2
+        if value >= middle:
+            bits = bits * 2 + 1
+            span[0] = middle
+        else:
+            bits = bits * 2
+            span[1] = middle
+        even = not even
+        bit += 1
+        if bit == 5:
+            chars.append(BASE32[bits])
+            bits, bit = 0, 0
+    return "".join(chars)
+
+
+def cell_size(precision):
+    """(height, width) of a geohash cell in degrees"""
+
+    lat_bits = 5 * precision // 2
+    lng_bits = 5 * precision - lat_bits
+    return 180 / 2**lat_bits, 360 / 2**lng_bits
+
+
+def bounding_box(latitude, longitude, radius):
+    """(south, north, west, east) in degrees around a circle of radius km"""
+
+    d_lat = radius / KM_PER_DEGREE
+    # 원에서 적도와 가장 먼 위도에서 경도 1도의 길이가 가장 짧다.
+    farthest = min(abs(latitude) + d_lat, 89.0)
+    d_lng = radius / (KM_PER_DEGREE * math.cos(math.radians(farthest)))
+    return (
+        max(latitude - d_lat, -90.0),
+        min(latitude + d_lat, 90.0),
+        longitude - d_lng,
+        longitude + d_lng,
+    )
+
+
+def steps(start, stop, step):
+    value = start
+    while value < stop:
+        yield value
+        value += step
+    yield stop
+
+
+def covering_cells(latitude, longitude, radius):
+    """Geohash prefixes whose cells together cover the circle
+
+    The finest precision whose cells over the circle's bounding box number
+    at most MAX_CELLS is used, so the candidates stay close to the circle
+    while the query needs only a handful of index range scans.
+    """
+
+    south, north, west, east = bounding_box(latitude, longitude, radius)
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        if ((north - south) / height + 2) * ((east - west) / width + 2) > MAX_CELLS * 4:
+            continue
+        cells = {
+            encode(min(lat, 89.999999), (lng + 180) % 360 - 180, precision)
+            for lat in steps(south, north, height)
+            for lng in steps(west, east, width)
+        }
+        if len(cells) <= MAX_CELLS:
+            return sorted(cells)
+    return [""]
+
+
+def near(latitude, longitude, radius):
+    """Q object keeping rooms in the cells around a point (one index range per cell)"""
+
+    condition = Q()
+    for cell in covering_cells(latitude, longitude, radius):
+        # startswith는 LIKE가 되어 인덱스를 못 탈 수 있으므로 범위 조건으로 쓴다. ("~"는 "z"보다 크다)
+        condition |= Q(geohash__gte=cell, geohash__lt=cell + "~")
+    # 셀 안에서도 원을 둘러싼 사각형 밖의 방은 DB에서 바로 걸러낸다.
+    south, north, west, east = bounding_box(latitude, longitude, radius)
+    condition &= Q(latitude__gte=south, latitude__lte=north)
+    if -180 <= west and east <= 180:
+        condition &= Q(longitude__gte=west, longitude__lte=east)
+    return condition
+
+
+def distances(latitude, longitude, latitudes, longitudes):
+    """Haversine distances in km from one point to many"""
+
+    if np is not None:
+        lat1, lng1 = np.radians(latitude), np.radians(longitude)
+        lat2 = np.radians(np.asarray(latitudes, dtype=float))
+        lng2 = np.radians(np.asarray(longitudes, dtype=float))
+        a = (
+            np.sin((lat2 - lat1) / 2) ** 2
+            + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+        )
+        return (2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))).tolist()
+    lat1, lng1 = math.radians(latitude), math.radians(longitude)
+    cos_lat1 = math.cos(lat1)
+    result = []
+    for lat, lng in zip(latitudes, longitudes):
+        lat2, lng2 = math.radians(lat), math.radians(lng)
+        a = (
+            math.sin((lat2 - lat1) / 2) ** 2
+            + cos_lat1 * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+        )
+        result.append(2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a)))
+    return result
+
+
+def rank_by_distance(rooms, latitude, longitude, radius, limit=None):
+    """Return [(distance, pk)] of the rooms within radius km, nearest first
+
+    rooms should already be pruned with near(); only the pk and coordinates
+    of the candidates are read. With a limit only the nearest ones are kept.
+    """
+
+    candidates = list(rooms.order_by().values_list("pk", "latitude", "longitude"))
+    if not candidates:
+        return []
+    pks, latitudes, longitudes = zip(*candidates)
+    ranked = [
+        (round(distance, 3), pk)
+        for pk, distance in zip(
+            pks, distances(latitude, longitude, latitudes, longitudes)
+        )
+        if distance <= radius
+    ]
+    if limit is not None and len(ranked) > limit:
+        return heapq.nsmallest(limit, ranked)
+    ranked.sort()
+    return ranked
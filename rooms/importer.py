@@ -0,0 +1,194 @@
+import csv
+import io
+import json
+import os
+from django.db import transaction
+from categories.models import Category
+from search.backends import get_backend
+from .models import Amenity, Room
+from .serializers import RoomDetailSerializer
+
+FORMATS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+}
+
+
+def get_format(filename):
+    return FORMATS.get(os.path.splitext(filename)[1].lower())
+
+
+def read_rows(stream, file_format):
+    """Yield (row number, data, error) from a binary CSV or JSON Lines stream
+
+    Rows are parsed one at a time, so the whole file is never held in memory.
+    A CSV that is not UTF-8 or cannot be parsed is reported as an error on
+    the row where reading stopped; the rows before it are still imported.
+    """
+
+    if file_format == "csv":
+        reader = csv.DictReader(
+            io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+        )
+        number = 0
+        while True:
+            number += 1
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except UnicodeDecodeError:
+                # 디코딩이 한 번 실패하면 그 뒤로는 줄을 나눌 수 없으므로 여기서 멈춘다.
+                yield number, None, {
+                    "non_field_errors": ["The file should be UTF-8 encoded."]
+                }
+                return
+            except csv.Error as error:
+                yield number, None, {"non_field_errors": [f"Invalid CSV: {error}"]}
+                return
+            # 빈 칸은 보내지 않은 것으로 보고 모델의 기본값을 사용한다.
+            data = {
+                key: value
+                for key, value in row.items()
+                if key and value not in ("", None)
+            }
+            if "amenities" in data:
+                data["amenities"] = [
+                    pk for pk in data["amenities"].split("|") if pk.strip()
+                ]
+            yield number, data, None
+    else:
+        for number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError:
+                yield number, None, {"non_field_errors": ["Invalid JSON."]}
+                continue
+            if not isinstance(data, dict):
+                yield number, None, {
+                    "non_field_errors": ["Each line should be a JSON object."]
+                }
+                continue
+            yield number, data, None
+
+
+def chunked(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def parse_pks(value):
+    if value in (None, ""):
+        return []
+    if not isinstance(value, list):
+        value = [value]
+    return [int(pk) for pk in value]
+
+
+def import_rooms(rows, owner, chunk_size=500):
+    """Validate and save rooms in chunks, collecting the errors of each bad row
+
+    A bad row is reported and skipped; it never aborts the rest of the file.
+    Each chunk is written with one bulk_create for the rooms and one for the
+    amenity through rows.
+    """
+
+    report = {"created": 0, "errors": []}
+    for chunk in chunked(rows, chunk_size):
+        report["created"] += import_chunk(chunk, owner, report["errors"])
+    return report
+
+
+def import_chunk(chunk, owner, errors):
+    valid = []
+    category_pks, amenity_pks = set(), set()
+    for number, data, error in chunk:
+        if error:
+            errors.append({"row": number, "errors": error})
+            continue
+        serializer = RoomDetailSerializer(data=data)
+        if not serializer.is_valid():
+            errors.append({"row": number, "errors": serializer.errors})
+            continue
+        try:
+            category_pk = int(data["category"])
+            row_amenity_pks = parse_pks(data.get("amenities"))
+        except KeyError:
+            errors.append(
+                {"row": number, "errors": {"category": ["Category is required."]}}
+            )
+            continue
+        except (TypeError, ValueError):
+            errors.append(
+                {
+                    "row": number,
+                    "errors": {"non_field_errors": ["Ids should be numbers."]},
+                }
+            )
+            continue
+        category_pks.add(category_pk)
+        amenity_pks.update(row_amenity_pks)
+        valid.append((number, serializer.validated_data, category_pk, row_amenity_pks))
+
+    # 청크 전체의 카테고리와 어메니티를 한 번씩만 조회한다.
+    categories = Category.objects.in_bulk(category_pks)
+    existing_amenities = set(
+        Amenity.objects.filter(pk__in=amenity_pks).values_list("pk", flat=True)
+    )
+
+    rooms, room_amenities = [], []
+    for number, validated_data, category_pk, row_amenity_pks in valid:
+        category = categories.get(category_pk)
+        if category is None:
+            errors.append(
+                {"row": number, "errors": {"category": ["Category not found"]}}
+            )
+            continue
+        if category.kind != Category.CategoryKindChoices.ROOMS:
+            errors.append(
+                {
+                    "row": number,
+                    "errors": {"category": ["The category kind should be 'rooms'"]},
+                }
+            )
+            continue
+        missing = sorted(set(row_amenity_pks) - existing_amenities)
+        if missing:
+            errors.append(
+                {
+                    "row": number,
+                    "errors": {
+                        "amenities": [
+                            f"Amenity not found: {', '.join(map(str, missing))}"
+                        ]
+                    },
+                }
+            )
+            continue
+        room = Room(**validated_data, owner=owner, category=category)
+        # bulk_create는 save()를 부르지 않으므로 geohash를 직접 채운다.
+        room.set_geohash()
+        rooms.append(room)
+        room_amenities.append(set(row_amenity_pks))
+
+    with transaction.atomic():
+        rooms = Room.objects.bulk_create(rooms)
+        Room.amenities.through.objects.bulk_create(
+            [
+                Room.amenities.through(room_id=room.pk, amenity_id=amenity_pk)
+                for room, amenity_pks in zip(rooms, room_amenities)
+                for amenity_pk in amenity_pks
+            ]
+        )
+        # bulk_create는 post_save를 보내지 않으므로 검색 인덱스를 직접 갱신한다.
+        get_backend().index("room", rooms)
+    return len(rooms)
@@ -0,0 +1,93 @@
+import random
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rooms import geo
+from rooms.models import Room
+from users.models import User
+
+# 한국 전체를 덮는 범위
+LATITUDES = (33.0, 38.6)
+LONGITUDES = (124.6, 131.0)
+
+
+class Command(BaseCommand):
+
+    help = "Time nearby room searches against generated rooms (rolled back afterwards)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rooms", type=int, default=1_000_000)
+        parser.add_argument("--radius", type=float, default=5)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--chunk-size", type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        # 벤치마크용 데이터는 전부 롤백해서 DB에 남기지 않는다.
+        with transaction.atomic():
+            self.seed(options)
+            self.measure(options)
+            transaction.set_rollback(True)
+
+    def seed(self, options):
+        started = time.perf_counter()
+        user = User.objects.create(username=f"benchmark-{time.time_ns()}")
+        remaining = options["rooms"]
+        while remaining:
+            size = min(remaining, options["chunk_size"])
+            rooms = []
+            for _ in range(size):
+                room = Room(
+                    name="Benchmark",
+                    price=random.randint(10, 500) * 1000,
+                    rooms=1,
+                    toilets=1,
+                    address="Benchmark",
+                    kind=Room.RooomKindChoices.ENTIRE_PLACE,
+                    owner=user,
+                    latitude=random.uniform(*LATITUDES),
+                    longitude=random.uniform(*LONGITUDES),
+                )
+                room.set_geohash()
+                rooms.append(room)
+            Room.objects.bulk_create(rooms)
+            remaining -= size
+        self.stdout.write(
+            f"Seeded {options['rooms']} rooms in {time.perf_counter() - started:.1f}s"
+        )
+
+    def measure(self, options):
+        radius = options["radius"]
+        points = [
+            (random.uniform(*LATITUDES), random.uniform(*LONGITUDES))
+            for _ in range(options["repeat"])
+        ]
+
+        # 비교 기준: 좌표가 있는 모든 방의 거리를 계산한다. (시간이 오래 걸려 세 번만 잰다)
+        scan = []
+        for latitude, longitude in points[:3]:
+            started = time.perf_counter()
+            geo.rank_by_distance(
+                Room.objects.filter(geohash__gt=""), latitude, longitude, radius
+            )
+            scan.append(time.perf_counter() - started)
+        self.report("full scan", scan)
+
+        pruned, candidates = [], 0
+        for latitude, longitude in points:
+            started = time.perf_counter()
+            rooms = Room.objects.filter(geo.near(latitude, longitude, radius))
+            geo.rank_by_distance(rooms, latitude, longitude, radius)
+            pruned.append(time.perf_counter() - started)
+            candidates += rooms.count()
+        self.report("geohash cells", pruned)
+        self.stdout.write(
+            f"{candidates // len(points)} candidates per search on average "
+            f"({'numpy' if geo.np is not None else 'math'} haversine)"
+        )
+
+    def report(self, label, timings):
+        timings.sort()
+        self.stdout.write(
+            f"{label}: p50 {timings[len(timings) // 2] * 1000:.2f}ms / "
+            f"max {timings[-1] * 1000:.2f}ms"
+        )
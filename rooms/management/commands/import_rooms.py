@@ -0,0 +1,47 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from rooms.importer import get_format, import_rooms, read_rows
+from users.models import User
+
+
+class Command(BaseCommand):
+
+    help = "Import rooms from a CSV or JSON Lines file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--owner", required=True, help="username of the host")
+        parser.add_argument("--chunk-size", type=int, default=500)
+        parser.add_argument(
+            "--max-errors",
+            type=int,
+            default=20,
+            help="how many row errors to print",
+        )
+
+    def handle(self, *args, **options):
+        file_format = get_format(options["path"])
+        if not file_format:
+            raise CommandError("The file should end with .csv, .jsonl or .ndjson")
+        try:
+            owner = User.objects.get(username=options["owner"])
+        except User.DoesNotExist:
+            raise CommandError(f"No user {options['owner']}")
+
+        started = time.perf_counter()
+        with open(options["path"], "rb") as stream:
+            report = import_rooms(
+                read_rows(stream, file_format),
+                owner,
+                chunk_size=options["chunk_size"],
+            )
+        elapsed = time.perf_counter() - started
+
+        for error in report["errors"][: options["max_errors"]]:
+            self.stderr.write(f"row {error['row']}: {error['errors']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report['created']} rooms, "
+                f"{len(report['errors'])} rows failed ({elapsed:.1f}s)"
+            )
+        )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from reviews.ratings import RATED, rebuild_ratings
+
+
+class Command(BaseCommand):
+
+    help = "Recalculate the rating aggregates stored on every room and experience"
+
+    def handle(self, *args, **options):
+        for field, model in RATED.items():
+            updated = rebuild_ratings(field, model)
+            self.stdout.write(
+                self.style.SUCCESS(f"Rebuilt ratings for {updated} {field}s")
+            )
@@ -0,0 +1,19 @@
+# Generated by Django 4.1.6 on 2026-10-18 15:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0004_room_rating_count_room_rating_total"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="room",
+            index=models.Index(
+                fields=["created_at", "id"], name="rooms_room_created_2438c1_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.1.6 on 2026-10-18 15:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0005_room_rooms_room_created_2438c1_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="room",
+            name="max_guests",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.1.6 on 2026-10-18 15:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0006_room_max_guests"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="room",
+            index=models.Index(
+                fields=["city", "price"], name="rooms_room_city_136688_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="room",
+            index=models.Index(
+                fields=["category", "kind"], name="rooms_room_categor_12372f_idx"
+            ),
+        ),
+    ]
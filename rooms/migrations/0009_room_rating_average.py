@@ -0,0 +1,45 @@
+# Generated by Django 4.1.6 on 2026-10-18 16:02
+
+from django.db import migrations, models
+from django.db.models import Count, FloatField, OuterRef, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+
+def fill_ratings(apps, schema_editor):
+    Room = apps.get_model("rooms", "Room")
+    Review = apps.get_model("reviews", "Review")
+    reviews = Review.objects.filter(room=OuterRef("pk")).order_by().values("room")
+    count = Coalesce(Subquery(reviews.annotate(count=Count("pk")).values("count")), 0)
+    total = Coalesce(Subquery(reviews.annotate(total=Sum("rating")).values("total")), 0)
+    Room.objects.update(
+        rating_average=Coalesce(Cast(total, FloatField()) / NullIf(count, 0), 0.0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0008_room_location"),
+        ("reviews", "0003_review_reviews_rev_room_id_60a6db_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="room",
+            name="rating_average",
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="room",
+            index=models.Index(
+                fields=["price", "id"], name="rooms_room_price_db2449_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="room",
+            index=models.Index(
+                fields=["rating_average", "id"], name="rooms_room_rating__c4da72_idx"
+            ),
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,10 @@
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
-from common.models import CommonModel
+from common.models import CommonModel, DenormalizedFieldsMixin
+from . import geo
 
 
-class Room(CommonModel):
+class Room(DenormalizedFieldsMixin, CommonModel):
 
     """Room Model Definition"""
 
@@ -22,7 +24,30 @@ class Room(CommonModel):
     toilets = models.PositiveIntegerField()
     description = models.TextField(blank=True)
     address = models.CharField(max_length=250)
+    latitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)],
+    )
+    longitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)],
+    )
+    # 위도/경도로 계산한 geohash. 앞부분이 같으면 가까운 곳이므로 범위 검색으로 주변 방을 찾는다.
+    geohash = models.CharField(
+        max_length=12,
+        blank=True,
+        default="",
+        editable=False,
+        db_index=True,
+    )
     pet_friendly = models.BooleanField(default=True)
+    # 비어 있으면 인원 제한이 없는 방으로 본다.
+    max_guests = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+    )
     kind = models.CharField(
         max_length=20,
         choices=RooomKindChoices.choices,
@@ -43,23 +68,49 @@ class Room(CommonModel):
         on_delete=models.SET_NULL,
         related_name="rooms",
     )
+    # 리뷰가 생성/수정/삭제될 때마다 reviews.signals에서 갱신된다.
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_total = models.PositiveIntegerField(default=0, editable=False)
+    # 평점순 정렬에 쓰는 평균 (rating_total / rating_count)
+    rating_average = models.FloatField(default=0, editable=False)
+
+    # 평점 필드는 F()로만 바꾸고, save()로는 덮어쓰지 않는다.
+    denormalized_fields = ("rating_count", "rating_total", "rating_average")
 
     def __str__(self) -> str:
         return self.name
 
+    def save(self, *args, **kwargs):
+        self.set_geohash()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "geohash"}
+        super().save(*args, **kwargs)
+
+    def set_geohash(self):
+        if self.latitude is None or self.longitude is None:
+            self.geohash = ""
+        else:
+            self.geohash = geo.encode(self.latitude, self.longitude)
+
     def total_amenities(self):
         return self.amenities.count()
 
     def rating(room):
-        count = room.reviews.count()
-
-        if count == 0:
+        if room.rating_count == 0:
             return 0
-        else:
-            total_rating = 0
-            for review in room.reviews.all().values("rating"):
-                total_rating += review["rating"]
-            return round(total_rating / count, 2)
+        return round(room.rating_total / room.rating_count, 2)
+
+    class Meta:
+        indexes = [
+            # 목록의 keyset pagination (created_at, pk) 순서
+            models.Index(fields=["created_at", "id"]),
+            models.Index(fields=["city", "price"]),
+            models.Index(fields=["category", "kind"]),
+            # 가격순/평점순 정렬과 가격 범위 검색, pk는 같은 값일 때의 순서
+            models.Index(fields=["price", "id"]),
+            models.Index(fields=["rating_average", "id"]),
+        ]
 
 
 class Amenity(CommonModel):
@@ -1,10 +1,11 @@
+from django.conf import settings
 from rest_framework import serializers
 from .models import Amenity, Room
 from users.serializers import TinyUserSerializer
 from reviews.serializers import ReviewSerializer
 from categories.serializers import CategorySerializer
 from medias.serializers import PhotoSerializer
-from wishlists.models import Wishlist
+from wishlists.liked import get_liked
 
 
 class AmenitySerializer(serializers.ModelSerializer):
@@ -35,12 +36,18 @@ class RoomDetailSerializer(serializers.ModelSerializer):
     is_owner = serializers.SerializerMethodField()
     is_liked = serializers.SerializerMethodField()
     photos = PhotoSerializer(many=True, read_only=True)
-    reviews = ReviewSerializer(read_only=True, many=True)
+    # 리뷰 전체는 /rooms/<pk>/reviews 에서 페이지로 보고, 상세에는 최신 리뷰 몇 개와 개수만 보여준다.
+    reviews = serializers.SerializerMethodField()
+    review_count = serializers.IntegerField(source="rating_count", read_only=True)
 
     class Meta:
         model = Room
         fields = "__all__"
 
+    def get_reviews(self, room):
+        reviews = room.reviews.select_related("user").order_by("-created_at", "-pk")
+        return ReviewSerializer(reviews[: settings.REVIEW_PREVIEW_SIZE], many=True).data
+
     def get_rating(self, room):
         # 위의 SerializerMethodField()와 필수적 관계이며
         # 인자는 self,와 현재 serializing 하고 있는 오브젝트
@@ -49,24 +56,19 @@ class RoomDetailSerializer(serializers.ModelSerializer):
     def get_is_owner(self, room):
         request = self.context.get("request")
         if request:
-            return room.owner == request.user
+            return room.owner_id == request.user.pk
         return False
 
     def get_is_liked(self, room):
-        request = self.context.get("request")
-        if request:
-            if request.user.is_authenticated:
-                # 룸을 보고 있는 user가 소유한 wishlist들을 찾는다.
-                # rooms list안에 사용자가 보고있는 room을 가지고 있는 wishlist를 찾아낸다.
-                return Wishlist.objects.filter(user=request.user, rooms__id=room.pk).exists()
-        return False
-        # user가 만든 wishlist중에 room id가 있는 room list를 포함한 wishlist를 찾아 유무를 확인해준다.
+        # user가 만든 wishlist들에 담긴 room id를 요청당 한 번만 불러와서 확인한다.
+        return room.pk in get_liked(self.context.get("request")).rooms
 
 
 class RoomListSerializer(serializers.ModelSerializer):
     rating = serializers.SerializerMethodField()
 
     is_owner = serializers.SerializerMethodField()
+    is_liked = serializers.SerializerMethodField()
     photos = PhotoSerializer(many=True, read_only=True)
 
     class Meta:
@@ -76,15 +78,29 @@ class RoomListSerializer(serializers.ModelSerializer):
             "name",
             "country",
             "city",
+            "latitude",
+            "longitude",
             "price",
             "rating",
             "is_owner",
+            "is_liked",
             "photos",
         )
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        # 방마다 사진을 따로 조회하지 않도록 한 번에 가져온다.
+        # rating은 Room에 저장된 값이고, is_owner는 owner_id만 비교하므로 추가 쿼리가 없다.
+        return queryset.prefetch_related("photos")
+
     def get_rating(self, room):
         return room.rating()
 
     def get_is_owner(self, room):
-        request = self.context["request"]
-        return room.owner == request.user
+        request = self.context.get("request")
+        if request:
+            return room.owner_id == request.user.pk
+        return False
+
+    def get_is_liked(self, room):
+        return room.pk in get_liked(self.context.get("request")).rooms
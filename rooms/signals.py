@@ -0,0 +1,34 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from common.cache import invalidate_detail
+from .models import Amenity, Room
+
+
+@receiver(post_save, sender=Room)
+@receiver(post_delete, sender=Room)
+def invalidate_room(sender, instance, **kwargs):
+    invalidate_detail("room", instance.pk)
+
+
+@receiver(m2m_changed, sender=Room.amenities.through)
+def invalidate_room_amenities(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        invalidate_detail("room", instance.pk)
+        return
+    # amenity.rooms.add(...) 처럼 반대편에서 바뀐 경우
+    room_pks = pk_set or instance.rooms.values_list("pk", flat=True)
+    for room_pk in room_pks:
+        invalidate_detail("room", room_pk)
+
+
+@receiver(post_save, sender=Amenity)
+@receiver(pre_delete, sender=Amenity)
+def invalidate_amenity_rooms(sender, instance, **kwargs):
+    # 어메니티 이름이 바뀌면 그 어메니티를 가진 모든 방의 상세가 바뀐다.
+    room_pks = Room.amenities.through.objects.filter(amenity=instance.pk).values_list(
+        "room", flat=True
+    )
+    for room_pk in room_pks:
+        invalidate_detail("room", room_pk)
@@ -1,11 +1,29 @@
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase
+from common.testing import NPlusOneTestMixin, build_room, create_room
 from . import models
 from users.models import User
+from medias.models import Photo
+from bookings.models import Booking
+from categories.models import Category
+from reviews.models import Review
+from wishlists.models import Wishlist
 
 # 테스트 코드는 전부 똑같다. 상태코드를 확인하고,
 # 예상했떤 것과 같은 name이 나오는지 확인한다.
 # 장고가 테스트해주길 원한다면 'test_'로 시작하는 메서드로 실행을 해야한다.
-class TestAmenities(APITestCase):
+class TestAmenities(NPlusOneTestMixin, APITestCase):
     URL = "/api/v1/rooms/amenities/"
     NAME = "Amenity Test"
     DESC = "Amenity Des"
@@ -71,7 +89,7 @@ class TestAmenities(APITestCase):
         self.assertIn("name", data)
 
 
-class TestAmenity(APITestCase):
+class TestAmenity(NPlusOneTestMixin, APITestCase):
 
     NAME = "Amenity Test"
     DESC = "Amenity Des"
@@ -129,7 +147,7 @@ class TestAmenity(APITestCase):
         self.assertEqual(response.status_code, 204)
 
 
-class TestRoom(APITestCase):
+class TestRoom(NPlusOneTestMixin, APITestCase):
     def setUp(self):
         user = User.objects.create(
             username="test",
@@ -152,3 +170,631 @@ class TestRoom(APITestCase):
         self.client.force_login(self.user)
         response = self.client.post("/api/v1/rooms/")
         print(response.json())
+
+
+class TestRoomsQueryCount(NPlusOneTestMixin, APITestCase):
+    URL = "/api/v1/rooms/"
+
+    def setUp(self):
+        self.user = User.objects.create(username="test")
+
+    def create_rooms(self, count):
+        rooms = models.Room.objects.bulk_create(
+            [build_room(self.user, name=f"Room {index}") for index in range(count)]
+        )
+        Photo.objects.bulk_create(
+            [
+                Photo(
+                    file="https://example.com/photo.jpg", description="Photo", room=room
+                )
+                for room in rooms
+            ]
+        )
+
+    def count_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.URL)
+        self.assertEqual(response.status_code, 200)
+        return len(context)
+
+    def test_query_count_is_flat(self):
+        self.create_rooms(10)
+        small = self.count_queries()
+
+        self.create_rooms(9990)
+        self.assertEqual(self.count_queries(), small)
+
+        # 로그인하면 세션, 유저, 위시리스트(is_liked) 조회가 한 번씩 늘어난다.
+        self.client.force_login(self.user)
+        self.assertEqual(self.count_queries(), small + 3)
+
+
+class TestRoomsPagination(NPlusOneTestMixin, APITestCase):
+    URL = "/api/v1/rooms/"
+
+    def setUp(self):
+        user = User.objects.create(username="test")
+        models.Room.objects.bulk_create(
+            [
+                build_room(
+                    user,
+                    name=f"Room {index}",
+                    # 같은 가격과 평점이 여러 개 있어야 pk로 순서를 정하는지 확인할 수 있다.
+                    price=1000 * (index % 3 + 1),
+                    rating_average=index % 4,
+                )
+                for index in range(12)
+            ]
+        )
+
+    def walk(self, params=None):
+        seen = []
+        url = self.URL
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            self.assertLessEqual(len(data["results"]), 5)
+            seen += [room["pk"] for room in data["results"]]
+            url, params = data["next"], None
+        return seen
+
+    def test_walk_pages(self):
+        expected = list(
+            models.Room.objects.order_by("-created_at", "-pk").values_list(
+                "pk", flat=True
+            )
+        )
+        self.assertEqual(self.walk(), expected)
+
+    def test_sort(self):
+        for sort, ordering in (
+            ("price", ("price", "pk")),
+            ("-price", ("-price", "-pk")),
+            ("rating", ("-rating_average", "-pk")),
+        ):
+            expected = list(
+                models.Room.objects.order_by(*ordering).values_list("pk", flat=True)
+            )
+            self.assertEqual(self.walk({"sort": sort}), expected)
+
+        expected = list(
+            models.Room.objects.filter(price__gte=2000)
+            .order_by("price", "pk")
+            .values_list("pk", flat=True)
+        )
+        self.assertEqual(self.walk({"sort": "price", "min_price": 2000}), expected)
+
+    def test_invalid_sort(self):
+        response = self.client.get(self.URL, {"sort": "name"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.URL, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 404)
+
+
+class TestRoomsAvailabilitySearch(NPlusOneTestMixin, APITestCase):
+    URL = "/api/v1/rooms/"
+
+    def setUp(self):
+        self.user = User.objects.create(username="test")
+        self.today = timezone.localtime(timezone.now()).date()
+        self.booked = self.create_room("Booked", max_guests=4)
+        self.free = self.create_room("Free", max_guests=2)
+        self.unlimited = self.create_room("Unlimited", max_guests=None)
+        Booking.objects.create(
+            kind=Booking.BookingKindChoices.ROOM,
+            user=self.user,
+            room=self.booked,
+            check_in=self.day(5),
+            check_out=self.day(8),
+            guests=2,
+        )
+
+    def create_room(self, name, max_guests):
+        return create_room(self.user, name=name, max_guests=max_guests)
+
+    def day(self, offset):
+        return self.today + timedelta(days=offset)
+
+    def search(self, **params):
+        response = self.client.get(self.URL, params)
+        self.assertEqual(response.status_code, 200)
+        return {room["name"] for room in response.json()["results"]}
+
+    def test_dates(self):
+        self.assertEqual(
+            self.search(check_in=self.day(6), check_out=self.day(10)),
+            {"Free", "Unlimited"},
+        )
+        self.assertEqual(
+            self.search(check_in=self.day(8), check_out=self.day(10)),
+            {"Booked", "Free", "Unlimited"},
+        )
+
+    def test_guests(self):
+        self.assertEqual(self.search(guests=3), {"Booked", "Unlimited"})
+        self.assertEqual(
+            self.search(check_in=self.day(6), check_out=self.day(7), guests=3),
+            {"Unlimited"},
+        )
+
+    def test_invalid_parameters(self):
+        response = self.client.get(self.URL, {"check_in": self.day(6)})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(
+            self.URL, {"check_in": self.day(6), "check_out": self.day(6)}
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class TestRoomsFacets(NPlusOneTestMixin, APITestCase):
+    URL = "/api/v1/rooms/"
+
+    def setUp(self):
+        self.user = User.objects.create(username="test")
+        self.category = Category.objects.create(
+            name="Rooms",
+            kind=Category.CategoryKindChoices.ROOMS,
+        )
+        self.wifi = models.Amenity.objects.create(name="Wifi")
+        self.pool = models.Amenity.objects.create(name="Pool")
+        self.create_room("Seoul cheap", "서울", 1000, True, [self.wifi])
+        self.create_room("Seoul pricey", "서울", 5000, False, [self.wifi, self.pool])
+        self.create_room("Busan", "부산", 3000, True, [self.pool], category=self.category)
+
+    def create_room(self, name, city, price, pet_friendly, amenities, category=None):
+        room = create_room(
+            self.user,
+            name=name,
+            city=city,
+            price=price,
+            pet_friendly=pet_friendly,
+            category=category,
+        )
+        room.amenities.set(amenities)
+        return room
+
+    def search(self, params):
+        response = self.client.get(self.URL, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def names(self, params):
+        return {room["name"] for room in self.search(params)["results"]}
+
+    def test_filters(self):
+        self.assertEqual(self.names({"city": "서울"}), {"Seoul cheap", "Seoul pricey"})
+        self.assertEqual(self.names({"pet_friendly": "false"}), {"Seoul pricey"})
+        self.assertEqual(self.names({"category": self.category.pk}), {"Busan"})
+        self.assertEqual(
+            self.names({"min_price": 2000, "max_price": 4000, "kind": "entire_place"}),
+            {"Busan"},
+        )
+        # 어메니티를 여러 개 보내면 모두 가진 방만 남는다.
+        self.assertEqual(
+            self.names({"amenities": [self.wifi.pk]}), {"Seoul cheap", "Seoul pricey"}
+        )
+        self.assertEqual(
+            self.names({"amenities": [self.wifi.pk, self.pool.pk]}), {"Seoul pricey"}
+        )
+
+    def test_facet_counts(self):
+        with CaptureQueriesContext(connection) as without_facets:
+            self.search({"city": "서울"})
+        with CaptureQueriesContext(connection) as with_facets:
+            facets = self.search({"city": "서울", "facets": "true"})["facets"]
+        self.assertEqual(len(with_facets), len(without_facets) + 1)
+
+        self.assertEqual(facets["city"], [{"value": "서울", "count": 2}])
+        self.assertEqual(
+            facets["pet_friendly"],
+            [{"value": False, "count": 1}, {"value": True, "count": 1}],
+        )
+        self.assertEqual(facets["category"], [])
+        self.assertEqual(
+            facets["amenities"],
+            [{"value": self.wifi.pk, "count": 2}, {"value": self.pool.pk, "count": 1}],
+        )
+        self.assertNotIn("facets", self.search({"city": "서울"}))
+
+    def test_invalid_parameters(self):
+        response = self.client.get(self.URL, {"min_price": 5000, "max_price": 1000})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(self.URL, {"kind": "castle"})
+        self.assertEqual(response.status_code, 400)
+
+
+class TestRoomsNearby(NPlusOneTestMixin, APITestCase):
+    URL = "/api/v1/rooms/"
+    CITY_HALL = "37.5665,126.9780"
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="test")
+        self.create_room("City Hall", 37.5665, 126.9780)
+        self.create_room("Gwanghwamun", 37.5759, 126.9769)
+        self.create_room("Gangnam", 37.4979, 127.0276)
+        self.create_room("Busan", 35.1796, 129.0756)
+        self.create_room("Nowhere", None, None)
+
+    def create_room(self, name, latitude, longitude):
+        return create_room(self.user, name=name, latitude=latitude, longitude=longitude)
+
+    def nearby(self, **params):
+        response = self.client.get(self.URL, {"near": self.CITY_HALL, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_geohash(self):
+        room = models.Room.objects.get(name="City Hall")
+        self.assertEqual(room.geohash, "wydm9qy89")
+        room.latitude = 35.1796
+        room.longitude = 129.0756
+        room.save(update_fields=["latitude", "longitude"])
+        room.refresh_from_db()
+        self.assertTrue(room.geohash.startswith("wy7b"))
+        self.assertEqual(models.Room.objects.get(name="Nowhere").geohash, "")
+
+    def test_radius_and_order(self):
+        results = self.nearby(radius=5)["results"]
+        self.assertEqual(
+            [room["name"] for room in results], ["City Hall", "Gwanghwamun"]
+        )
+        self.assertEqual(results[0]["distance"], 0)
+        self.assertAlmostEqual(results[1]["distance"], 1.05, places=1)
+
+        names = [room["name"] for room in self.nearby(radius=10)["results"]]
+        self.assertEqual(names, ["City Hall", "Gwanghwamun", "Gangnam"])
+
+    def test_walk_pages(self):
+        names, params = [], {"radius": 10}
+        with self.settings(PAGE_SIZE=2):
+            while True:
+                data = self.nearby(**params)
+                names += [room["name"] for room in data["results"]]
+                if not data["next"]:
+                    break
+                params["cursor"] = data["next"].split("cursor=")[1].split("&")[0]
+        self.assertEqual(names, ["City Hall", "Gwanghwamun", "Gangnam"])
+
+    def test_with_other_filters(self):
+        facets = self.nearby(radius=10, city="서울", facets="true")["facets"]
+        self.assertEqual(facets["city"], [{"value": "서울", "count": 3}])
+
+    def test_facets_match_results(self):
+        # 좌표 범위(사각형)의 모서리에 있지만 반경 밖인 방은 facet에서도 빠진다.
+        self.create_room("Corner", 37.5665 + 0.04, 126.9780 + 0.05)
+        data = self.nearby(radius=5, facets="true")
+        self.assertEqual(len(data["results"]), 2)
+        self.assertEqual(
+            data["facets"]["kind"], [{"value": "entire_place", "count": 2}]
+        )
+        with self.settings(NEARBY_MAX_RESULTS=1):
+            cache.clear()
+            facets = self.nearby(radius=10, facets="true")["facets"]
+        self.assertEqual(facets["kind"], [{"value": "entire_place", "count": 1}])
+
+    def test_ranking_is_capped_and_cached(self):
+        with self.settings(NEARBY_MAX_RESULTS=2, PAGE_SIZE=1):
+            data = self.nearby(radius=10)
+            self.assertEqual([room["name"] for room in data["results"]], ["City Hall"])
+            cursor = data["next"].split("cursor=")[1].split("&")[0]
+            # 다음 페이지는 캐시된 순위를 쓰므로 다시 계산하지 않는다.
+            with mock.patch("rooms.views.rank_by_distance") as rank:
+                data = self.nearby(radius=10, cursor=cursor)
+            rank.assert_not_called()
+            self.assertEqual(
+                [room["name"] for room in data["results"]], ["Gwanghwamun"]
+            )
+            self.assertIsNone(data["next"])
+
+    def test_invalid_parameters(self):
+        for params in (
+            {"near": "north"},
+            {"near": "91,0"},
+            {"near": self.CITY_HALL, "radius": 0},
+        ):
+            response = self.client.get(self.URL, params)
+            self.assertEqual(response.status_code, 400)
+
+
+class TestRoomDetailCache(NPlusOneTestMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create(username="owner")
+        self.guest = User.objects.create(username="guest")
+        self.room = create_room(self.owner)
+        self.url = f"/api/v1/rooms/{self.room.pk}"
+
+    def get(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response.json(), len(context)
+
+    def test_cached_payload(self):
+        first, first_queries = self.get()
+        second, second_queries = self.get()
+        self.assertEqual(first, second)
+        # 캐시에서 꺼내면 방을 찾는 쿼리 하나만 남는다.
+        self.assertEqual(second_queries, 1)
+        self.assertLess(second_queries, first_queries)
+
+    def test_invalidation(self):
+        self.get()
+        Review.objects.create(user=self.guest, room=self.room, payload="Good", rating=4)
+        data, _ = self.get()
+        self.assertEqual(data["rating"], 4)
+
+        Photo.objects.create(
+            file="https://example.com/photo.jpg", description="Photo", room=self.room
+        )
+        data, _ = self.get()
+        self.assertEqual(len(data["photos"]), 1)
+
+        amenity = models.Amenity.objects.create(name="Wifi")
+        self.room.amenities.add(amenity)
+        data, _ = self.get()
+        self.assertEqual([amenity["name"] for amenity in data["amenities"]], ["Wifi"])
+
+        amenity.name = "Fast Wifi"
+        amenity.save()
+        data, _ = self.get()
+        self.assertEqual(
+            [amenity["name"] for amenity in data["amenities"]], ["Fast Wifi"]
+        )
+
+        self.room.name = "Renamed"
+        self.room.save()
+        data, _ = self.get()
+        self.assertEqual(data["name"], "Renamed")
+
+    def test_user_fields_are_not_cached(self):
+        self.client.force_login(self.owner)
+        data, _ = self.get()
+        self.assertTrue(data["is_owner"])
+
+        self.client.force_login(self.guest)
+        data, _ = self.get()
+        self.assertFalse(data["is_owner"])
+        wishlist = Wishlist.objects.create(name="Trip", user=self.guest)
+        wishlist.rooms.add(self.room)
+        data, _ = self.get()
+        self.assertTrue(data["is_liked"])
+
+
+class TestRoomDetailReviews(NPlusOneTestMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="test")
+        self.room = create_room(self.user)
+
+    def add_reviews(self, count):
+        for index in range(count):
+            Review.objects.create(
+                user=User.objects.create(username=f"guest{Review.objects.count()}"),
+                room=self.room,
+                payload=f"Review {index}",
+                rating=5,
+            )
+
+    def get_detail(self):
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f"/api/v1/rooms/{self.room.pk}")
+        return response.json(), len(context)
+
+    def test_latest_reviews_preview(self):
+        self.add_reviews(10)
+        data, _ = self.get_detail()
+        self.assertEqual(data["review_count"], 10)
+        self.assertEqual(
+            [review["payload"] for review in data["reviews"]],
+            ["Review 9", "Review 8", "Review 7"],
+        )
+
+    def test_query_count_does_not_grow(self):
+        self.add_reviews(3)
+        _, few = self.get_detail()
+        self.add_reviews(30)
+        _, many = self.get_detail()
+        self.assertEqual(few, many)
+
+
+class TestRoomAmenityAssignment(NPlusOneTestMixin, APITestCase):
+    URL = "/api/v1/rooms/"
+
+    def setUp(self):
+        self.user = User.objects.create(username="test")
+        self.category = Category.objects.create(
+            name="Rooms",
+            kind=Category.CategoryKindChoices.ROOMS,
+        )
+        self.amenities = models.Amenity.objects.bulk_create(
+            [models.Amenity(name=f"Amenity {index}") for index in range(50)]
+        )
+        self.client.force_authenticate(self.user)
+
+    def room_data(self, amenities):
+        return {
+            "name": "Room",
+            "price": 1000,
+            "rooms": 1,
+            "toilets": 1,
+            "address": "123",
+            "kind": models.Room.RooomKindChoices.ENTIRE_PLACE,
+            "category": self.category.pk,
+            "amenities": [amenity.pk for amenity in amenities],
+        }
+
+    def create_room(self, amenities):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                self.URL, self.room_data(amenities), format="json"
+            )
+        self.assertEqual(response.status_code, 200)
+        return response.json(), len(context)
+
+    def test_query_count_does_not_depend_on_amenities(self):
+        data, few = self.create_room(self.amenities[:5])
+        self.assertEqual(len(data["amenities"]), 5)
+        data, many = self.create_room(self.amenities)
+        self.assertEqual(len(data["amenities"]), 50)
+        self.assertEqual(few, many)
+
+    def test_missing_amenities(self):
+        data = self.room_data(self.amenities[:2])
+        data["amenities"] += [9998, 9999]
+        response = self.client.post(self.URL, data, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("9998, 9999", response.json()["detail"])
+        self.assertFalse(models.Room.objects.exists())
+
+    def test_update_amenities(self):
+        data, _ = self.create_room(self.amenities[:3])
+        response = self.client.put(
+            f"{self.URL}{data['id']}",
+            {"amenities": [amenity.pk for amenity in self.amenities[2:6]]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        room = models.Room.objects.get(pk=data["id"])
+        self.assertEqual(
+            set(room.amenities.values_list("pk", flat=True)),
+            {amenity.pk for amenity in self.amenities[2:6]},
+        )
+
+
+class TestRoomImport(NPlusOneTestMixin, APITestCase):
+    URL = "/api/v1/rooms/import"
+
+    def setUp(self):
+        self.user = User.objects.create(username="test", is_staff=True)
+        self.category = Category.objects.create(
+            name="Rooms",
+            kind=Category.CategoryKindChoices.ROOMS,
+        )
+        self.wifi = models.Amenity.objects.create(name="Wifi")
+        self.pool = models.Amenity.objects.create(name="Pool")
+        self.client.force_authenticate(self.user)
+
+    def upload(self, name, content):
+        return self.client.post(
+            self.URL,
+            {"file": SimpleUploadedFile(name, content.encode())},
+            format="multipart",
+        )
+
+    def test_csv(self):
+        content = (
+            "name,price,rooms,toilets,address,kind,category,amenities,max_guests\n"
+            f"Good,1000,1,1,123,entire_place,{self.category.pk},"
+            f"{self.wifi.pk}|{self.pool.pk},\n"
+            f"No price,,1,1,123,entire_place,{self.category.pk},,\n"
+            f"Bad amenity,1000,1,1,123,entire_place,{self.category.pk},999,4\n"
+        )
+        response = self.upload("rooms.csv", content)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["created"], 1)
+        self.assertEqual([error["row"] for error in data["errors"]], [2, 3])
+        self.assertIn("price", data["errors"][0]["errors"])
+
+        room = models.Room.objects.get()
+        self.assertEqual(room.owner, self.user)
+        self.assertEqual(room.category, self.category)
+        self.assertIsNone(room.max_guests)
+        self.assertEqual(set(room.amenities.all()), {self.wifi, self.pool})
+
+    def test_jsonl(self):
+        experiences = Category.objects.create(
+            name="Experiences",
+            kind=Category.CategoryKindChoices.EXPERIENCES,
+        )
+        good = {
+            "name": "Good",
+            "price": 1000,
+            "rooms": 1,
+            "toilets": 1,
+            "address": "123",
+            "kind": "private_room",
+            "category": self.category.pk,
+        }
+        lines = [
+            json.dumps(good),
+            "{not json",
+            json.dumps({**good, "category": experiences.pk}),
+            "",
+            json.dumps({**good, "name": "Also good", "amenities": [self.wifi.pk]}),
+        ]
+        response = self.upload("rooms.jsonl", "\n".join(lines))
+        data = response.json()
+        self.assertEqual(data["created"], 2)
+        self.assertEqual([error["row"] for error in data["errors"]], [2, 3])
+        self.assertEqual(models.Room.objects.count(), 2)
+
+    def test_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as file:
+            for index in range(30):
+                file.write(
+                    json.dumps(
+                        {
+                            "name": f"Room {index}",
+                            "price": 1000,
+                            "rooms": 1,
+                            "toilets": 1,
+                            "address": "123",
+                            "kind": "entire_place",
+                            "category": self.category.pk,
+                            "amenities": [self.wifi.pk],
+                        }
+                    )
+                    + "\n"
+                )
+        self.addCleanup(os.remove, file.name)
+        call_command(
+            "import_rooms",
+            file.name,
+            owner="test",
+            chunk_size=7,
+            stdout=StringIO(),
+            stderr=StringIO(),
+        )
+        self.assertEqual(models.Room.objects.filter(amenities=self.wifi).count(), 30)
+
+    def test_csv_not_utf8(self):
+        content = (
+            "name,price,rooms,toilets,address,kind,category\n"
+            f"Café,1000,1,1,123,entire_place,{self.category.pk}\n"
+        ).encode("latin-1")
+        response = self.client.post(
+            self.URL,
+            {"file": SimpleUploadedFile("rooms.csv", content)},
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["created"], 0)
+        self.assertEqual(
+            data["errors"],
+            [
+                {
+                    "row": 1,
+                    "errors": {
+                        "non_field_errors": ["The file should be UTF-8 encoded."]
+                    },
+                }
+            ],
+        )
+
+    def test_admin_only(self):
+        self.client.force_authenticate(User.objects.create(username="guest"))
+        response = self.upload("rooms.csv", "name\nRoom\n")
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(models.Room.objects.exists())
+
+    def test_unknown_format(self):
+        response = self.upload("rooms.xlsx", "")
+        self.assertEqual(response.status_code, 400)
@@ -3,6 +3,7 @@ from . import views
 
 urlpatterns = [
     path("", views.Rooms.as_view()),
+    path("import", views.RoomImport.as_view()),
     path("<int:pk>", views.RoomDetail.as_view()),
     path("<int:pk>/reviews", views.RoomReviews.as_view()),
     path("<int:pk>/amenities", views.RoomAmenities.as_view()),
@@ -1,10 +1,14 @@
+import hashlib
+from urllib.parse import urlencode
 from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
 from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.status import HTTP_204_NO_CONTENT, HTTP_400_BAD_REQUEST
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAdminUser, IsAuthenticatedOrReadOnly
 from rest_framework.exceptions import (
     NotFound,
     ParseError,
@@ -15,8 +19,16 @@ from reviews.serializers import ReviewSerializer
 from medias.serializers import PhotoSerializer
 from categories.models import Category
 from .models import Amenity, Room
+from .filters import facet_counts, filter_rooms, parse_filters
+from .geo import rank_by_distance
+from .importer import get_format, import_rooms, read_rows
 from bookings.models import Booking
-from bookings.serializers import PublicBookingSerializer, CreateRoomBookingSerializer
+from bookings.serializers import PublicBookingSerializer
+from bookings.availability import create_room_booking
+from common.cache import get_cached_detail
+from common.m2m import fetch_related
+from common.filters import SORTS
+from common.pagination import KeysetPagination, RankedPagination
 
 
 class Amenities(APIView):
@@ -75,13 +87,60 @@ class Rooms(APIView):
     permission_classes = [IsAuthenticatedOrReadOnly]
 
     def get(self, request):
-        all_rooms = Room.objects.all()
+        filters = parse_filters(request.query_params)
+        filtered = filter_rooms(Room.objects.all(), filters)
+        if "near" in filters:
+            # 거리순 정렬은 후보 방의 좌표로 파이썬에서 계산한다. (sort보다 우선한다)
+            paginator = RankedPagination()
+            ranked = self.rank_nearby(request, filtered, filters)
+            rooms = paginator.paginate_ranked(
+                ranked,
+                RoomListSerializer.setup_eager_loading(Room.objects.all()),
+                request,
+            )
+            # facet은 결과와 같은 방(반경 안, 최대 NEARBY_MAX_RESULTS개)만 센다.
+            # facet마다 pk 목록이 들어가므로 facet 수 * NEARBY_MAX_RESULTS가
+            # SQLite 변수 한도(32766)보다 작아야 한다.
+            filtered = Room.objects.filter(pk__in=[pk for distance, pk in ranked])
+        else:
+            paginator = KeysetPagination(ordering=SORTS[filters["sort"]])
+            rooms = paginator.paginate_queryset(
+                RoomListSerializer.setup_eager_loading(filtered),
+                request,
+            )
         serializer = RoomListSerializer(
-            all_rooms,
+            rooms,
             many=True,
             context={"request": request},
         )
-        return Response(serializer.data)
+        data = serializer.data
+        if "near" in filters:
+            for room, (distance, pk) in zip(data, paginator.keys):
+                room["distance"] = distance
+        response = paginator.get_paginated_response(data)
+        if request.query_params.get("facets") in ("1", "true"):
+            response.data["facets"] = facet_counts(filtered)
+        return response
+
+    def rank_nearby(self, request, filtered, filters):
+        # 페이지를 넘길 때마다 다시 계산하지 않도록 같은 조건의 순위는 잠시 캐시에 둔다.
+        params = sorted(
+            (key, value)
+            for key, values in request.query_params.lists()
+            if key not in ("cursor", "facets")
+            for value in values
+        )
+        key = "nearby:" + hashlib.sha1(urlencode(params).encode()).hexdigest()
+        ranked = cache.get(key)
+        if ranked is None:
+            ranked = rank_by_distance(
+                filtered,
+                *filters["near"],
+                filters["radius"],
+                limit=settings.NEARBY_MAX_RESULTS,
+            )
+            cache.set(key, ranked, settings.NEARBY_CACHE_TIMEOUT)
+        return ranked
 
     def post(self, request):
 
@@ -99,18 +158,16 @@ class Rooms(APIView):
             except Category.DoesNotExist:
                 raise ParseError("Category not found")
 
+            amenities = fetch_related(Amenity, amenity_pks) if amenity_pks else []
+
             try:
                 with transaction.atomic():
                     new_room = serializer.save(
                         owner=request.user,
                         category=category,
                     )
-                    if amenity_pks:
-                        for amenity_pk in amenity_pks:
-                            amenity = Amenity.objects.get(pk=amenity_pk)
-                            new_room.amenities.add(amenity)
-            except Amenity.DoesNotExist:
-                raise ParseError("Amenity not found!")
+                    if amenities:
+                        new_room.amenities.set(amenities)
             except Exception as e:
                 raise ParseError(e)
             serializer = RoomDetailSerializer(new_room, context={"request": request})
@@ -119,6 +176,30 @@ class Rooms(APIView):
             return Response(serializer.errors, status=HTTP_400_BAD_REQUEST)
 
 
+class RoomImport(APIView):
+
+    """Bulk-create rooms owned by the requesting admin from a CSV or JSON Lines upload
+
+    The import runs synchronously inside this request (chunked bulk writes
+    and search index rows), so it is limited to admins. Large files should
+    go through the import_rooms management command instead.
+    """
+
+    permission_classes = [IsAdminUser]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if not upload:
+            raise ParseError("file is required.")
+        file_format = get_format(upload.name)
+        if not file_format:
+            raise ParseError("The file should end with .csv, .jsonl or .ndjson")
+        # 파일을 한 줄씩 읽어서 청크 단위로 저장한다. 잘못된 줄은 건너뛰고 결과에 담아서 돌려준다.
+        report = import_rooms(read_rows(upload.file, file_format), request.user)
+        return Response(report)
+
+
 class RoomDetail(APIView):
 
     permission_classes = [IsAuthenticatedOrReadOnly]
@@ -134,11 +215,21 @@ class RoomDetail(APIView):
         # context는 내가 원하는 context를 전달 할 수 있게 해줌.
         # 그로인해 많은 것을 할 수 있다. serialize.py의 is_owner메서드같은....
         # 그러면 오너인 방들에만 수정권한을 준다던지 할 수 있음. 인스타그램의 라이크여부에 따라 하트모양
+        # 요청한 유저와 상관없는 부분은 캐시에서 가져오고, is_owner/is_liked만 새로 계산해서 덮어쓴다.
+        data = get_cached_detail(
+            "room", room.pk, lambda: RoomDetailSerializer(room).data
+        )
         serializer = RoomDetailSerializer(
             room,
             context={"request": request},
         )
-        return Response(serializer.data)
+        return Response(
+            {
+                **data,
+                "is_owner": serializer.get_is_owner(room),
+                "is_liked": serializer.get_is_liked(room),
+            }
+        )
 
     def delete(self, request, pk):
 
@@ -168,19 +259,19 @@ class RoomDetail(APIView):
                 except Category.DoesNotExist:
                     ParseError(detail="Category not found")
 
+            amenity_pks = request.data.get("amenities")
+            amenities = fetch_related(Amenity, amenity_pks) if amenity_pks else None
+
             try:
                 with transaction.atomic():
                     if category_pk:
                         updated_room = serializer.save(category=category)
                     else:
                         updated_room = serializer.save()
-                    amenities = request.data.get("amenities")
 
                     if amenities:
-                        room.amenities.clear()
-                        for amenity_pk in amenities:
-                            amenity = Amenity.objects.get(pk=amenity_pk)
-                            updated_room.amenities.add(amenity)
+                        # 바뀐 어메니티만 추가/삭제한다.
+                        updated_room.amenities.set(amenities)
                     serializer = RoomDetailSerializer(
                         updated_room,
                         context={"request": request},
@@ -221,7 +312,9 @@ class RoomReviews(APIView):
             # 대괄호로 인덱스 범위를 설정해줄 수 있다. pagination
             # 0:4는 리스트안에 a,b,c,d,e가 있을 때 offset인 0 인덱스는 포함하지만('a')
             # Limit 4 인덱스는 포함하지않고 이전에서 끝난다.
-            room.reviews.all()[start:end],
+            room.reviews.select_related("user").order_by("-created_at", "-pk")[
+                start:end
+            ],
             many=True,
         )
         return Response(serializer.data)
@@ -308,17 +401,11 @@ class RoomBookings(APIView):
         return Response(serializer.data)
 
     def post(self, request, pk):
-        room = self.get_object(pk)
         # 모델을 살펴보면 guests만 required이기때문에 새로 만들어줌..
-        serializer = CreateRoomBookingSerializer(data=request.data)
-        # is_valid 메서드를 통해 과거의 날짜는 false가 나오도록 커스터마이징함.
-        if serializer.is_valid():
-            booking = serializer.save(
-                room=room,
-                user=request.user,
-                kind=Booking.BookingKindChoices.ROOM,
-            )
-            serializer = PublicBookingSerializer(booking)
-            return Response(serializer.data)
-        else:
-            return Response(serializer.errors)
+        # 검증과 저장은 방을 잠근 하나의 transaction 안에서 이루어진다.
+        try:
+            booking = create_room_booking(pk, request.user, request.data)
+        except Room.DoesNotExist:
+            raise NotFound
+        serializer = PublicBookingSerializer(booking)
+        return Response(serializer.data)
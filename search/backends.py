@@ -0,0 +1,153 @@
+import re
+from collections import Counter
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, Sum
+from .models import SearchTerm
+
+FTS_TABLE = "search_fts"
+
+# 검색할 필드와 가중치. 이름에서 찾은 단어가 설명에서 찾은 단어보다 중요하다.
+FIELDS = {
+    "room": ("name", "description", "city", "address"),
+    "experience": ("name", "description", "city", "address"),
+}
+WEIGHTS = {
+    "name": 10,
+    "description": 1,
+    "city": 5,
+    "address": 2,
+}
+COLUMNS = ("name", "description", "city", "address")
+KINDS = ("room", "experience")
+
+TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return [token.lower() for token in TOKEN.findall(text or "")]
+
+
+def document(kind, obj):
+    return {field: getattr(obj, field) or "" for field in FIELDS[kind]}
+
+
+class FTS5Backend:
+
+    """SQLite FTS5 virtual table ranked with bm25()
+
+    The rowid packs the object pk and its kind (pk * 2 + kind), so a listing
+    is replaced or removed through the rowid index without scanning.
+    """
+
+    def rowid(self, kind, pk):
+        return pk * len(KINDS) + KINDS.index(kind)
+
+    def index(self, kind, objects):
+        rows = []
+        for obj in objects:
+            values = document(kind, obj)
+            rows.append(
+                [self.rowid(kind, obj.pk)]
+                + [values.get(column, "") for column in COLUMNS]
+            )
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid = %s",
+                [[row[0]] for row in rows],
+            )
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(COLUMNS)}) "
+                f"VALUES (%s, {', '.join(['%s'] * len(COLUMNS))})",
+                rows,
+            )
+
+    def remove(self, kind, pk):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [self.rowid(kind, pk)]
+            )
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+
+    def search(self, terms, offset, limit):
+        # 따옴표로 감싸면 사용자가 보낸 글자가 FTS 문법으로 해석되지 않는다. 공백은 AND 이다.
+        query = " ".join(f'"{term}"' for term in terms)
+        weights = ", ".join(str(float(WEIGHTS[column])) for column in COLUMNS)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid, bm25({FTS_TABLE}, {weights}) AS score FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH %s ORDER BY score, rowid LIMIT %s OFFSET %s",
+                [query, limit, offset],
+            )
+            return [
+                (KINDS[rowid % len(KINDS)], rowid // len(KINDS), -score)
+                for rowid, score in cursor.fetchall()
+            ]
+
+
+class TermBackend:
+
+    """Pure Python tokenizer writing an inverted index into SearchTerm rows"""
+
+    def index(self, kind, objects):
+        objects = list(objects)
+        if not objects:
+            return
+        SearchTerm.objects.filter(
+            kind=kind, object_id__in=[obj.pk for obj in objects]
+        ).delete()
+        rows = []
+        for obj in objects:
+            weights = Counter()
+            for field, value in document(kind, obj).items():
+                for token in tokenize(value):
+                    weights[token[:100]] += WEIGHTS[field]
+            rows += [
+                SearchTerm(term=term, kind=kind, object_id=obj.pk, weight=weight)
+                for term, weight in weights.items()
+            ]
+        SearchTerm.objects.bulk_create(rows)
+
+    def remove(self, kind, pk):
+        SearchTerm.objects.filter(kind=kind, object_id=pk).delete()
+
+    def clear(self):
+        SearchTerm.objects.all().delete()
+
+    def search(self, terms, offset, limit):
+        terms = set(terms)
+        counts = dict(
+            SearchTerm.objects.filter(term__in=terms)
+            .values("term")
+            .annotate(count=Count("pk"))
+            .values_list("term", "count")
+        )
+        if len(counts) < len(terms):
+            return []
+        # 가장 드문 단어를 가진 문서만 후보로 삼아서 흔한 단어의 행을 전부 훑지 않는다.
+        rarest = min(counts, key=counts.get)
+        candidates = SearchTerm.objects.filter(term=rarest).values("object_id")
+        # 모든 단어를 가진 문서만 남기고, 찾은 단어들의 가중치 합으로 순위를 매긴다.
+        matches = (
+            SearchTerm.objects.filter(term__in=terms, object_id__in=candidates)
+            .values("kind", "object_id")
+            .annotate(score=Sum("weight"), matched=Count("term", distinct=True))
+            .filter(matched=len(terms))
+            .order_by("-score", "kind", "object_id")
+        )
+        return [
+            (match["kind"], match["object_id"], match["score"])
+            for match in matches[offset : offset + limit]
+        ]
+
+
+def get_backend():
+    name = settings.SEARCH_BACKEND
+    if name == "auto":
+        name = "fts5" if connection.vendor == "sqlite" else "terms"
+    return FTS5Backend() if name == "fts5" else TermBackend()
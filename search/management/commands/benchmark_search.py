@@ -0,0 +1,109 @@
+import random
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from rooms.models import Room
+from search.backends import FTS5Backend, TermBackend
+from users.models import User
+
+WORDS = (
+    "cozy quiet sunny modern spacious charming rustic bright private luxury "
+    "ocean mountain river forest garden terrace balcony loft studio cabin "
+    "villa cottage apartment beach lake view downtown station market"
+).split()
+# 드물게 나오는 단어도 섞어야 실제 검색처럼 일부 문서만 맞는다.
+RARE_WORDS = [f"word{index}" for index in range(10_000)]
+CITIES = ("Seoul", "Busan", "Jeju", "Incheon", "Daegu", "Gwangju", "Daejeon", "Ulsan")
+
+
+class Command(BaseCommand):
+
+    help = (
+        "Time full-text search backends on generated listings (rolled back afterwards)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--listings", type=int, default=100_000)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--chunk-size", type=int, default=5_000)
+
+    def handle(self, *args, **options):
+        # 벤치마크용 데이터는 전부 롤백해서 DB에 남기지 않는다.
+        with transaction.atomic():
+            rooms = self.seed(options)
+            queries = [
+                [random.choice(WORDS), random.choice(RARE_WORDS)]
+                for _ in range(options["repeat"])
+            ]
+            self.measure_scan(queries)
+            backends = [("terms", TermBackend())]
+            if connection.vendor == "sqlite":
+                backends.insert(0, ("fts5", FTS5Backend()))
+            for label, backend in backends:
+                self.measure_backend(label, backend, rooms, queries, options)
+            transaction.set_rollback(True)
+
+    def seed(self, options):
+        started = time.perf_counter()
+        user = User.objects.create(username=f"benchmark-{time.time_ns()}")
+        rooms = []
+        remaining = options["listings"]
+        while remaining:
+            size = min(remaining, options["chunk_size"])
+            rooms += Room.objects.bulk_create(
+                [
+                    Room(
+                        name=" ".join(
+                            random.sample(WORDS, 2) + random.sample(RARE_WORDS, 1)
+                        ),
+                        description=" ".join(
+                            random.choices(WORDS, k=20)
+                            + random.choices(RARE_WORDS, k=10)
+                        ),
+                        city=random.choice(CITIES),
+                        price=random.randint(10, 500) * 1000,
+                        rooms=1,
+                        toilets=1,
+                        address="Benchmark",
+                        kind=Room.RooomKindChoices.ENTIRE_PLACE,
+                        owner=user,
+                    )
+                    for _ in range(size)
+                ]
+            )
+            remaining -= size
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"Seeded {options['listings']} listings in {elapsed:.1f}s")
+        return rooms
+
+    def measure_scan(self, queries):
+        # 비교 기준: 인덱스 없이 icontains로 모든 행을 훑는 검색
+        timings = []
+        for terms in queries:
+            condition = Q()
+            for term in terms:
+                condition &= Q(name__icontains=term) | Q(description__icontains=term)
+            started = time.perf_counter()
+            list(Room.objects.filter(condition).values_list("pk", flat=True)[:20])
+            timings.append(time.perf_counter() - started)
+        self.report("icontains scan", timings)
+
+    def measure_backend(self, label, backend, rooms, queries, options):
+        started = time.perf_counter()
+        for index in range(0, len(rooms), options["chunk_size"]):
+            backend.index("room", rooms[index : index + options["chunk_size"]])
+        self.stdout.write(f"{label}: indexed in {time.perf_counter() - started:.1f}s")
+        timings = []
+        for terms in queries:
+            started = time.perf_counter()
+            backend.search(terms, 0, 20)
+            timings.append(time.perf_counter() - started)
+        self.report(f"{label} search[:20]", timings)
+
+    def report(self, label, timings):
+        timings.sort()
+        self.stdout.write(
+            f"{label}: p50 {timings[len(timings) // 2] * 1000:.2f}ms / "
+            f"max {timings[-1] * 1000:.2f}ms"
+        )
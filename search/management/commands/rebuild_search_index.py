@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from experiences.models import Experience
+from rooms.models import Room
+from search.backends import get_backend
+
+
+class Command(BaseCommand):
+
+    help = "Rebuild the search index of every room and experience"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        chunk_size = options["chunk_size"]
+        with transaction.atomic():
+            backend.clear()
+            for kind, model in (("room", Room), ("experience", Experience)):
+                chunk, count = [], 0
+                for obj in model.objects.order_by("pk").iterator(chunk_size=chunk_size):
+                    chunk.append(obj)
+                    if len(chunk) == chunk_size:
+                        backend.index(kind, chunk)
+                        count += len(chunk)
+                        chunk = []
+                backend.index(kind, chunk)
+                count += len(chunk)
+                self.stdout.write(f"Indexed {count} {kind}s")
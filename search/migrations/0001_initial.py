@@ -0,0 +1,66 @@
+# Generated by Django 4.1.6 on 2026-10-18 15:41
+
+from django.db import migrations, models
+
+
+def create_fts_table(apps, schema_editor):
+    # FTS5 가상 테이블은 SQLite에만 만든다. 다른 DB는 SearchTerm 테이블을 쓴다.
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE search_fts USING fts5("
+        "name, description, city, address, tokenize='unicode61')"
+    )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS search_fts")
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchTerm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("term", models.CharField(max_length=100)),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("room", "Room"), ("experience", "Experience")],
+                        max_length=15,
+                    ),
+                ),
+                ("object_id", models.PositiveBigIntegerField()),
+                ("weight", models.PositiveIntegerField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="searchterm",
+            index=models.Index(
+                fields=["term", "kind"], name="search_sear_term_b017ca_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="searchterm",
+            index=models.Index(
+                fields=["kind", "object_id"], name="search_sear_kind_540241_idx"
+            ),
+        ),
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
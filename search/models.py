@@ -0,0 +1,28 @@
+from django.db import models
+
+
+class SearchTerm(models.Model):
+
+    """Inverted index row used when the database has no full-text search (FTS5)"""
+
+    class KindChoices(models.TextChoices):
+        ROOM = "room", "Room"
+        EXPERIENCE = "experience", "Experience"
+
+    term = models.CharField(max_length=100)
+    kind = models.CharField(
+        max_length=15,
+        choices=KindChoices.choices,
+    )
+    object_id = models.PositiveBigIntegerField()
+    # 이름에 나온 단어일수록 더 높은 점수를 준다.
+    weight = models.PositiveIntegerField()
+
+    def __str__(self) -> str:
+        return f"{self.term} → {self.kind}:{self.object_id}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["term", "kind"]),
+            models.Index(fields=["kind", "object_id"]),
+        ]
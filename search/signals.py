@@ -0,0 +1,25 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from experiences.models import Experience
+from rooms.models import Room
+from .backends import get_backend
+
+
+@receiver(post_save, sender=Room)
+def index_room(sender, instance, **kwargs):
+    get_backend().index("room", [instance])
+
+
+@receiver(post_delete, sender=Room)
+def remove_room(sender, instance, **kwargs):
+    get_backend().remove("room", instance.pk)
+
+
+@receiver(post_save, sender=Experience)
+def index_experience(sender, instance, **kwargs):
+    get_backend().index("experience", [instance])
+
+
+@receiver(post_delete, sender=Experience)
+def remove_experience(sender, instance, **kwargs):
+    get_backend().remove("experience", instance.pk)
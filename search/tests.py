@@ -0,0 +1,96 @@
+import datetime
+from django.core.management import call_command
+from django.test import override_settings
+from io import StringIO
+from rest_framework.test import APITestCase
+from experiences.models import Experience
+from common.testing import create_room
+from users.models import User
+from .models import SearchTerm
+
+
+class SearchTestMixin:
+    URL = "/api/v1/search"
+
+    def setUp(self):
+        self.user = User.objects.create(username="test")
+        self.seaside = self.create_room(
+            "Seaside loft", "Quiet loft near the beach", "Busan"
+        )
+        self.garden = self.create_room(
+            "Garden house", "Sunny house with a beach view", "Seoul"
+        )
+        self.tour = Experience.objects.create(
+            name="Beach tour",
+            host=self.user,
+            price=1000,
+            address="Haeundae",
+            start=datetime.time(9),
+            end=datetime.time(12),
+            description="Walk along the beach",
+        )
+
+    def create_room(self, name, description, city):
+        return create_room(self.user, name=name, description=description, city=city)
+
+    def search(self, q, page=1):
+        response = self.client.get(self.URL, {"q": q, "page": page})
+        self.assertEqual(response.status_code, 200)
+        return [(result["kind"], result["pk"]) for result in response.json()["results"]]
+
+    def test_ranking(self):
+        # 이름에 나온 단어가 설명에만 나온 단어보다 앞에 온다.
+        results = self.search("beach")
+        self.assertEqual(results[0], ("experience", self.tour.pk))
+        self.assertEqual(
+            set(results[1:]),
+            {("room", self.seaside.pk), ("room", self.garden.pk)},
+        )
+
+    def test_all_terms_required(self):
+        self.assertEqual(self.search("quiet BEACH"), [("room", self.seaside.pk)])
+        self.assertEqual(self.search("busan"), [("room", self.seaside.pk)])
+        self.assertEqual(self.search("quiet mountain"), [])
+
+    def test_index_follows_changes(self):
+        self.seaside.name = "Mountain cabin"
+        self.seaside.save()
+        self.assertEqual(self.search("mountain"), [("room", self.seaside.pk)])
+        self.assertEqual(self.search("seaside"), [])
+
+        self.seaside.delete()
+        self.assertEqual(self.search("mountain"), [])
+
+    def test_pagination(self):
+        with self.settings(PAGE_SIZE=2):
+            first = self.search("beach")
+            second = self.search("beach", page=2)
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 1)
+        self.assertFalse(set(first) & set(second))
+
+    def test_rebuild(self):
+        call_command("rebuild_search_index", stdout=StringIO())
+        self.assertEqual(self.search("quiet beach"), [("room", self.seaside.pk)])
+
+    def test_missing_query(self):
+        response = self.client.get(self.URL)
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(SEARCH_BACKEND="fts5")
+class TestFTS5Search(SearchTestMixin, APITestCase):
+    def test_special_characters(self):
+        # FTS5 문법 문자가 들어가도 에러 없이 단어로만 검색한다.
+        self.assertEqual(self.search('quiet" OR *'), [])
+        self.assertEqual(self.search("quiet*"), [("room", self.seaside.pk)])
+
+
+@override_settings(SEARCH_BACKEND="terms")
+class TestTermSearch(SearchTestMixin, APITestCase):
+    def test_terms_are_stored(self):
+        self.assertTrue(
+            SearchTerm.objects.filter(
+                kind="room", object_id=self.seaside.pk, term="loft"
+            ).exists()
+        )
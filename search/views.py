@@ -0,0 +1,46 @@
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from experiences.models import Experience
+from rooms.models import Room
+from .backends import get_backend, tokenize
+
+
+class Search(APIView):
+    def get(self, request):
+        terms = tokenize(request.query_params.get("q"))
+        if not terms:
+            raise ParseError("q is required.")
+        try:
+            page = int(request.query_params.get("page", 1))
+        except ValueError:
+            page = 1
+        page = max(page, 1)
+        page_size = settings.PAGE_SIZE
+        matches = get_backend().search(terms, (page - 1) * page_size, page_size)
+
+        # 검색 결과의 방과 체험을 종류별로 한 번씩만 조회한다.
+        objects = {
+            "room": Room.objects.in_bulk(
+                [pk for kind, pk, score in matches if kind == "room"],
+            ),
+            "experience": Experience.objects.in_bulk(
+                [pk for kind, pk, score in matches if kind == "experience"],
+            ),
+        }
+        results = []
+        for kind, pk, score in matches:
+            obj = objects[kind].get(pk)
+            if obj:
+                results.append(
+                    {
+                        "kind": kind,
+                        "pk": pk,
+                        "name": obj.name,
+                        "city": obj.city,
+                        "price": obj.price,
+                        "score": round(score, 4),
+                    }
+                )
+        return Response({"page": page, "results": results})
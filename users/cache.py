@@ -0,0 +1,165 @@
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router
+from rest_framework.authtoken.models import Token
+from .models import User
+
+
+class LRUCache:
+
+    """Thread-safe, size-bounded in-process cache; entries expire after ttl seconds"""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+# 비밀번호 해시는 캐시에 넣지 않는다. 필요하면 deferred 필드로 그때 읽어온다.
+FIELDS = [
+    field.attname for field in User._meta.concrete_fields if field.attname != "password"
+]
+
+users = LRUCache(settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL)
+usernames = LRUCache(settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL)
+# authtoken 키 -> (user pk, 발급 시각)
+auth_tokens = LRUCache(settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL)
+
+
+def shared_key(pk):
+    return f"user:{pk}"
+
+
+def shared_token_key(key):
+    return f"authtoken:{key}"
+
+
+def build(values):
+    # 요청마다 새 인스턴스를 만들어서, 한 요청이 바꾼 값이 다른 요청에 보이지 않게 한다.
+    return User.from_db(router.db_for_read(User), FIELDS, values)
+
+
+def get_user(pk):
+    """Return the user with this pk, from the cache when possible, or None"""
+
+    values = users.get(pk)
+    if values is None and settings.USER_CACHE_SHARED:
+        values = cache.get(shared_key(pk))
+        if values is not None:
+            users.set(pk, values)
+    if values is None:
+        values = User.objects.filter(pk=pk).values_list(*FIELDS).first()
+        if values is None:
+            return None
+        remember(pk, values)
+    return build(values)
+
+
+def get_user_by_username(username):
+    pk = usernames.get(username)
+    if pk is not None:
+        user = get_user(pk)
+        # 그 사이에 username이 바뀌었을 수 있으므로 확인한다.
+        if user is not None and user.username == username:
+            return user
+        usernames.delete(username)
+    values = User.objects.filter(username=username).values_list(*FIELDS).first()
+    if values is None:
+        return None
+    user = build(values)
+    remember(user.pk, values)
+    usernames.set(username, user.pk)
+    return user
+
+
+def remember(pk, values):
+    users.set(pk, values)
+    if settings.USER_CACHE_SHARED:
+        cache.set(shared_key(pk), values, settings.USER_CACHE_TTL)
+
+
+def forget(pk):
+    users.delete(pk)
+    if settings.USER_CACHE_SHARED:
+        cache.delete(shared_key(pk))
+
+
+def get_token(key):
+    """Return (user pk, created) of an auth token (cached when possible), or None"""
+
+    values = auth_tokens.get(key)
+    if values is None and settings.USER_CACHE_SHARED:
+        values = cache.get(shared_token_key(key))
+        if values is not None:
+            auth_tokens.set(key, values)
+    if values is None:
+        values = Token.objects.filter(key=key).values_list("user_id", "created").first()
+        if values is None:
+            return None
+        remember_token(key, values)
+    return values
+
+
+def remember_token(key, values):
+    auth_tokens.set(key, values)
+    if settings.USER_CACHE_SHARED:
+        cache.set(shared_token_key(key), values, settings.USER_CACHE_TTL)
+
+
+def forget_token(key):
+    auth_tokens.delete(key)
+    if settings.USER_CACHE_SHARED:
+        cache.delete(shared_token_key(key))
+
+
+def warm_tokens(tokens):
+    """Put tokens and their users into the shared cache; returns how many were cached"""
+
+    tokens = list(tokens)
+    values = User.objects.in_bulk([token.user_id for token in tokens])
+    user_values = {
+        pk: tuple(getattr(user, field) for field in FIELDS)
+        for pk, user in values.items()
+    }
+    cache.set_many(
+        {
+            **{
+                shared_token_key(token.key): (token.user_id, token.created)
+                for token in tokens
+            },
+            **{shared_key(pk): row for pk, row in user_values.items()},
+        },
+        settings.USER_CACHE_TTL,
+    )
+    return len(tokens)
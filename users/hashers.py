@@ -0,0 +1,83 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from django.conf import settings
+from django.contrib.auth.hashers import ScryptPasswordHasher as BaseScryptPasswordHasher
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+
+class ScryptPasswordHasher(BaseScryptPasswordHasher):
+
+    """Scrypt whose cost comes from settings.SCRYPT_WORK_FACTOR / SCRYPT_BLOCK_SIZE
+
+    Hashes stored with another cost are still verified with their own cost
+    and upgraded on the next login.
+    """
+
+    work_factor = settings.SCRYPT_WORK_FACTOR
+    block_size = settings.SCRYPT_BLOCK_SIZE
+    # scrypt는 128 * n * r 바이트를 쓰므로 OpenSSL 기본 한도(32MB)를 넘지 않도록 여유 있게 잡는다.
+    maxmem = 256 * work_factor * block_size
+
+
+# 로그인 요청이 기다리지 않도록 새 해시는 이 스레드에서 계산한다.
+executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="password-rehash")
+inline = threading.local()
+
+
+def rehash(user_pk, old_encoded, raw_password):
+    from .cache import forget
+    from .models import User
+
+    # 그 사이에 비밀번호가 바뀌었다면 덮어쓰지 않는다. (compare-and-set)
+    updated = User.objects.filter(pk=user_pk, password=old_encoded).update(
+        password=make_password(raw_password)
+    )
+    if updated:
+        # update()는 signal을 보내지 않으므로 유저 캐시를 직접 지운다.
+        forget(user_pk)
+
+
+def rehash_in_background(user_pk, old_encoded, raw_password):
+    try:
+        rehash(user_pk, old_encoded, raw_password)
+    finally:
+        connection.close()
+
+
+def log_failure(future):
+    # JWT 로그인은 결과를 기다리지 않으므로 실패를 여기서 남긴다. 해시는 다음 로그인에 다시 바꾼다.
+    error = future.exception()
+    if error is not None:
+        logger.error("Password rehash failed", exc_info=error)
+
+
+@contextmanager
+def rehash_inline():
+    """Rehash outdated passwords on the calling thread inside this block
+
+    Session logins store a value derived from the password hash, so they
+    need the new hash before login() runs. Doing it here, instead of waiting
+    on the shared executor, keeps one login from queueing behind the
+    rehashes of other users.
+    """
+
+    inline.active = True
+    try:
+        yield
+    finally:
+        inline.active = False
+
+
+def schedule_rehash(user_pk, old_encoded, raw_password):
+    if settings.PASSWORD_REHASH_ASYNC and not getattr(inline, "active", False):
+        future = executor.submit(
+            rehash_in_background, user_pk, old_encoded, raw_password
+        )
+        future.add_done_callback(log_failure)
+        return future
+    rehash(user_pk, old_encoded, raw_password)
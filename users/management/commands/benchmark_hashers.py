@@ -0,0 +1,52 @@
+import time
+from django.contrib.auth.hashers import get_hasher, get_hashers_by_algorithm
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+
+    help = "Compare login (password check) latency across the configured hashers"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        password = "benchmark-password"
+        preferred = get_hasher()
+        timings = {}
+        for algorithm, hasher in get_hashers_by_algorithm().items():
+            try:
+                encoded = hasher.encode(password, hasher.salt())
+            except ValueError as error:
+                # argon2-cffi, bcrypt처럼 설치되지 않은 라이브러리가 필요한 해시는 건너뛴다.
+                self.stdout.write(f"{algorithm}: skipped ({error})")
+                continue
+            timings[algorithm] = self.measure(
+                lambda: hasher.verify(password, encoded), options["repeat"]
+            )
+            self.report(algorithm, timings[algorithm])
+
+            if algorithm != preferred.algorithm:
+                # 예전 해시로 로그인하면서 요청 안에서 새 해시로 바꿀 때 (PASSWORD_REHASH_ASYNC=False)
+                def login_with_rehash():
+                    hasher.verify(password, encoded)
+                    preferred.encode(password, preferred.salt())
+
+                self.report(
+                    f"{algorithm} + sync rehash to {preferred.algorithm}",
+                    self.measure(login_with_rehash, options["repeat"]),
+                )
+
+    def measure(self, check, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            check()
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        return timings
+
+    def report(self, label, timings):
+        p95 = timings[min(int(len(timings) * 0.95), len(timings) - 1)]
+        p50 = timings[len(timings) // 2]
+        self.stdout.write(f"{label}: p50 {p50 * 1000:.1f}ms / p95 {p95 * 1000:.1f}ms")
@@ -0,0 +1,74 @@
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+import jwt
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from users import tokens
+from users.cache import get_user
+from users.models import RevokedToken, User
+
+
+class Command(BaseCommand):
+
+    help = "Measure JWT verification throughput (generated rows are rolled back)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=5_000)
+        parser.add_argument("--revoked", type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        # 벤치마크용 데이터는 전부 롤백해서 DB에 남기지 않는다.
+        with transaction.atomic():
+            user = User.objects.create(username=f"benchmark-{time.time_ns()}")
+            expires_at = datetime.now(tz=timezone.utc) + timedelta(days=1)
+            RevokedToken.objects.bulk_create(
+                [
+                    RevokedToken(jti=uuid.uuid4().hex, expires_at=expires_at)
+                    for _ in range(options["revoked"])
+                ]
+            )
+            tokens.denylist.invalidate()
+            self.measure(user, options["requests"])
+            transaction.set_rollback(True)
+        tokens.denylist.invalidate()
+
+    def measure(self, user, count):
+        legacy = jwt.encode(
+            {"pk": user.pk}, settings.SECRET_KEY, algorithm=tokens.ALGORITHM
+        )
+        access = tokens.issue_tokens(user)[tokens.ACCESS]
+
+        def legacy_path():
+            # 예전 방식: 서명만 확인하고 매번 유저를 조회한다.
+            claims = jwt.decode(
+                legacy, settings.SECRET_KEY, algorithms=[tokens.ALGORITHM]
+            )
+            User.objects.get(pk=claims["pk"])
+
+        def without_bloom():
+            claims = jwt.decode(
+                access, settings.SECRET_KEY, algorithms=[tokens.ALGORITHM]
+            )
+            RevokedToken.objects.filter(jti=claims["jti"]).exists()
+            get_user(claims["pk"])
+
+        def with_bloom():
+            get_user(tokens.decode(access, tokens.ACCESS)["pk"])
+
+        # 첫 호출에서 Bloom filter를 만든다.
+        with_bloom()
+        for label, verify in (
+            ("signature + user query", legacy_path),
+            ("cached user + denylist query", without_bloom),
+            ("cached user + bloom filter", with_bloom),
+        ):
+            started = time.perf_counter()
+            for _ in range(count):
+                verify()
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{label}: {count / elapsed:,.0f} verifications/s "
+                f"({elapsed / count * 1_000_000:.0f}us each)"
+            )
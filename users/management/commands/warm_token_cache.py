@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.authtoken.models import Token
+from users.cache import warm_tokens
+
+
+class Command(BaseCommand):
+
+    help = "Load the tokens of the most recently active users into the shared cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=1000)
+        parser.add_argument("--chunk-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        # 이 명령은 별도 프로세스라서 프로세스 안의 LRU는 웹 서버와 나눠 쓸 수 없다.
+        if not settings.USER_CACHE_SHARED:
+            raise CommandError(
+                "USER_CACHE_SHARED is off, so there is no shared cache to warm."
+            )
+        hot = Token.objects.filter(user__is_active=True).order_by(
+            "-user__last_login", "-created"
+        )[: options["limit"]]
+        chunk, warmed = [], 0
+        for token in hot.iterator(chunk_size=options["chunk_size"]):
+            chunk.append(token)
+            if len(chunk) == options["chunk_size"]:
+                warmed += warm_tokens(chunk)
+                chunk = []
+        warmed += warm_tokens(chunk)
+        self.stdout.write(self.style.SUCCESS(f"Warmed {warmed} tokens"))
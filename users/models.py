@@ -1,4 +1,5 @@
 from django.db import models
+from django.contrib.auth.hashers import check_password
 from django.contrib.auth.models import AbstractUser
 
 
@@ -45,3 +46,26 @@ class User(AbstractUser):
         max_length=5,
         choices=CurrencyChoices.choices,
     )
+
+    def check_password(self, raw_password):
+        # 예전 해시(다른 알고리즘이나 비용)로 저장된 비밀번호는 로그인 응답을 기다리게 하지 않고
+        # 백그라운드에서 새 해시로 바꾼다. (세션 로그인은 hashers.rehash_inline 안에서 바로 바꾼다)
+        def setter(raw_password):
+            from .hashers import schedule_rehash
+
+            if schedule_rehash(self.pk, self.password, raw_password) is None:
+                self.refresh_from_db(fields=["password"])
+
+        return check_password(raw_password, self.password, setter)
+
+
+class RevokedToken(models.Model):
+
+    """JWT that was revoked before it expired (logout or refresh rotation)"""
+
+    jti = models.CharField(max_length=64, unique=True)
+    # 만료된 토큰은 어차피 거절되므로 이 시각이 지나면 지워도 된다.
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self) -> str:
+        return self.jti
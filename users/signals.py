@@ -0,0 +1,25 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from .cache import forget, forget_token
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user(sender, instance, **kwargs):
+    # 비밀번호 변경도 save()를 거치므로 여기서 함께 지워진다.
+    # 커밋 전에 다른 요청이 옛 값을 다시 캐시했을 수 있으므로 커밋 후에 한 번 더 지운다.
+    forget(instance.pk)
+    pk = instance.pk
+    transaction.on_commit(lambda: forget(pk))
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_token(sender, instance, **kwargs):
+    # 토큰을 지우거나 새로 발급하면(키가 바뀌면) 캐시된 예전 키는 더 이상 쓸 수 없다.
+    forget_token(instance.key)
+    key = instance.key
+    transaction.on_commit(lambda: forget_token(key))
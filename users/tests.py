@@ -1,3 +1,458 @@
-from django.test import TestCase
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+from unittest import mock
+import jwt
+from django.conf import settings
+from django.core.cache import cache as shared_cache
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authentication import SessionAuthentication, TokenAuthentication
+from rest_framework.authtoken.models import Token
+from django.contrib.auth.hashers import make_password
+from rest_framework.test import APIClient, APITestCase, APITransactionTestCase
+from common.metrics import REGISTRY
+from config.authentication import TrustMeBroAuthentication
+from . import cache, hashers, tokens
+from .models import RevokedToken, User
 
-# Create your tests here.
+
+class TestLRUCache(TestCase):
+    def test_size_and_ttl(self):
+        lru = cache.LRUCache(maxsize=2, ttl=10)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        lru.get("a")
+        lru.set("c", 3)
+        # 가장 오래 쓰지 않은 b가 밀려난다.
+        self.assertIsNone(lru.get("b"))
+        self.assertEqual(lru.get("a"), 1)
+
+        with mock.patch("users.cache.time.monotonic", return_value=10**9):
+            self.assertIsNone(lru.get("a"))
+
+
+class TestUserCache(APITestCase):
+    URL = "/api/v1/users/me"
+
+    def setUp(self):
+        cache.users.clear()
+        cache.usernames.clear()
+        self.user = User.objects.create(username="test", name="Test")
+        self.user.set_password("123")
+        self.user.save()
+
+    def user_queries(self, **headers):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.URL, **headers)
+        self.assertEqual(response.status_code, 200)
+        return [
+            query for query in queries if 'FROM "users_user"' in query["sql"]
+        ], response
+
+    def test_trust_me_skips_user_query(self):
+        queries, _ = self.user_queries(HTTP_TRUST_ME="test")
+        self.assertEqual(len(queries), 1)
+        queries, response = self.user_queries(HTTP_TRUST_ME="test")
+        self.assertEqual(queries, [])
+        self.assertEqual(response.json()["username"], "test")
+
+    def test_invalidated_on_save(self):
+        self.user_queries(HTTP_TRUST_ME="test")
+        self.user.name = "Changed"
+        self.user.save()
+        queries, response = self.user_queries(HTTP_TRUST_ME="test")
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(response.json()["name"], "Changed")
+
+        self.user.username = "renamed"
+        self.user.save()
+        response = self.client.get(self.URL, HTTP_TRUST_ME="test")
+        self.assertEqual(response.status_code, 403)
+
+    def test_copies_and_password(self):
+        first = cache.get_user(self.user.pk)
+        first.name = "Changed in a request"
+        second = cache.get_user(self.user.pk)
+        self.assertEqual(second.name, "Test")
+        # 비밀번호 해시는 캐시하지 않고 필요할 때 읽어온다.
+        self.assertIn("password", second.get_deferred_fields())
+        self.assertTrue(second.check_password("123"))
+
+    @override_settings(USER_CACHE_SHARED=True)
+    def test_shared_cache(self):
+        cache.get_user(self.user.pk)
+        # 다른 프로세스처럼 자기 LRU가 비어 있어도 공용 캐시에서 가져온다.
+        cache.users.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(cache.get_user(self.user.pk).username, "test")
+        self.user.save()
+        cache.users.clear()
+        with self.assertNumQueries(1):
+            cache.get_user(self.user.pk)
+
+
+class TestDispatchingAuthentication(APITestCase):
+    URL = "/api/v1/users/me"
+
+    def setUp(self):
+        REGISTRY.clear()
+        cache.users.clear()
+        self.user = User.objects.create(username="test")
+        self.user.set_password("123")
+        self.user.save()
+
+    def test_only_matching_backend_runs(self):
+        token = tokens.issue_tokens(self.user)[tokens.ACCESS]
+        with mock.patch.object(
+            SessionAuthentication, "authenticate"
+        ) as session, mock.patch.object(
+            TrustMeBroAuthentication, "authenticate"
+        ) as trust_me, mock.patch.object(
+            TokenAuthentication, "authenticate"
+        ) as token_auth:
+            response = self.client.get(self.URL, HTTP_JWT=token)
+        self.assertEqual(response.status_code, 200)
+        session.assert_not_called()
+        trust_me.assert_not_called()
+        token_auth.assert_not_called()
+        self.assertEqual(
+            REGISTRY.get("auth_backend_duration_seconds", backend="jwt").count, 1
+        )
+        self.assertIsNone(
+            REGISTRY.get("auth_backend_duration_seconds", backend="session")
+        )
+
+    def test_token(self):
+        token = Token.objects.create(user=self.user)
+        response = self.client.get(self.URL, HTTP_AUTHORIZATION=f"Token {token.key}")
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(self.URL, HTTP_AUTHORIZATION="Token wrong")
+        self.assertEqual(response.status_code, 403)
+
+    def test_session(self):
+        self.client.login(username="test", password="123")
+        response = self.client.get(self.URL)
+        self.assertEqual(response.status_code, 200)
+
+    def test_priority(self):
+        # 세션 쿠키가 있어도 로그인하지 않은 세션이면 다음 방법(Trust-me)으로 넘어간다.
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = "anonymous"
+        response = self.client.get(self.URL, HTTP_TRUST_ME="test")
+        self.assertEqual(response.status_code, 200)
+
+    def test_anonymous(self):
+        response = self.client.get(self.URL)
+        self.assertEqual(response.status_code, 403)
+
+
+class TestJWT(APITestCase):
+    def setUp(self):
+        cache.users.clear()
+        self.user = User.objects.create(username="test", is_host=True)
+        self.user.set_password("123")
+        self.user.save()
+
+    def login(self):
+        response = self.client.post(
+            "/api/v1/users/jwt-login", {"username": "test", "password": "123"}
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def me(self, access):
+        return self.client.get("/api/v1/users/me", HTTP_JWT=access)
+
+    def test_claims(self):
+        issued = self.login()
+        claims = tokens.decode(issued["access"], tokens.ACCESS)
+        self.assertEqual(claims["username"], "test")
+        self.assertTrue(claims["is_host"])
+        self.assertLessEqual(
+            claims["exp"] - claims["iat"], settings.JWT_ACCESS_LIFETIME
+        )
+        # refresh 토큰으로는 API를 호출할 수 없다.
+        self.assertEqual(self.me(issued["refresh"]).status_code, 403)
+
+    def test_cached_user(self):
+        access = self.login()["access"]
+        self.assertEqual(self.me(access).status_code, 200)
+        # 두 번째 요청부터는 users.cache에서 유저를 가져오므로 유저를 조회하지 않는다.
+        with CaptureQueriesContext(connection) as queries:
+            response = self.me(access)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any('FROM "users_user"' in query["sql"] for query in queries))
+
+    def test_save_keeps_current_values(self):
+        access = self.login()["access"]
+        User.objects.filter(pk=self.user.pk).update(username="new", is_host=False)
+        cache.users.clear()
+        response = self.client.put("/api/v1/users/me", {"name": "x"}, HTTP_JWT=access)
+        self.assertEqual(response.status_code, 200)
+        # 토큰의 예전 claim(username, is_host)이 DB에 다시 저장되면 안 된다.
+        self.user.refresh_from_db()
+        self.assertEqual(
+            (self.user.username, self.user.is_host, self.user.name), ("new", False, "x")
+        )
+
+    def test_deleted_or_inactive_user(self):
+        access = self.login()["access"]
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.me(access).status_code, 403)
+        self.user.delete()
+        self.assertEqual(self.me(access).status_code, 403)
+
+    def test_expired_and_legacy_tokens(self):
+        with mock.patch("users.tokens.datetime") as clock:
+            clock.now.return_value = datetime.now(tz=timezone.utc) - timedelta(days=1)
+            clock.fromtimestamp = datetime.fromtimestamp
+            expired = tokens.issue_tokens(self.user)["access"]
+        self.assertEqual(self.me(expired).json()["detail"], "Token expired")
+        legacy = jwt.encode(
+            {"pk": self.user.pk}, settings.SECRET_KEY, algorithm="HS256"
+        )
+        self.assertEqual(self.me(legacy).status_code, 403)
+
+    def test_refresh_rotation(self):
+        refresh = self.login()["refresh"]
+        response = self.client.post("/api/v1/users/jwt-refresh", {"refresh": refresh})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.me(response.json()["access"]).status_code, 200)
+        # 이미 쓴 refresh 토큰은 다시 쓸 수 없다.
+        response = self.client.post("/api/v1/users/jwt-refresh", {"refresh": refresh})
+        self.assertEqual(response.status_code, 403)
+
+    def test_revoke_twice(self):
+        # 같은 refresh 토큰으로 동시에 갱신하면 먼저 폐기한 요청만 통과한다.
+        claims = tokens.decode(self.login()["refresh"], tokens.REFRESH)
+        tokens.revoke(claims)
+        with self.assertRaises(tokens.InvalidToken):
+            tokens.revoke(claims)
+
+    def test_prune_expired(self):
+        RevokedToken.objects.create(
+            jti="expired",
+            expires_at=datetime.now(tz=timezone.utc) - timedelta(seconds=1),
+        )
+        tokens.revoke(tokens.decode(self.login()["refresh"], tokens.REFRESH))
+        self.assertFalse(RevokedToken.objects.filter(jti="expired").exists())
+        self.assertEqual(RevokedToken.objects.count(), 1)
+
+    def test_logout_revokes(self):
+        issued = self.login()
+        response = self.client.post(
+            "/api/v1/users/jwt-logout",
+            {"refresh": issued["refresh"]},
+            HTTP_JWT=issued["access"],
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(RevokedToken.objects.count(), 2)
+        self.assertEqual(self.me(issued["access"]).json()["detail"], "Token revoked")
+        response = self.client.post(
+            "/api/v1/users/jwt-refresh", {"refresh": issued["refresh"]}
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_bloom_filter(self):
+        bloom = tokens.BloomFilter(size=1024, hashes=3)
+        bloom.add("revoked")
+        self.assertIn("revoked", bloom)
+        self.assertNotIn("other", bloom)
+        # 폐기된 토큰이 없으면 Bloom filter만 보고 DB는 조회하지 않는다.
+        tokens.denylist.invalidate()
+        tokens.denylist.get_filter()
+        with self.assertNumQueries(0):
+            self.assertFalse(tokens.denylist.contains("not-revoked"))
+
+    def test_no_denylist_query_per_request(self):
+        access = self.login()["access"]
+        self.assertEqual(self.me(access).status_code, 200)
+        # 기본 설정(프로세스마다 따로인 캐시)에서도 다음 요청은 폐기 목록을 조회하지 않는다.
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.me(access).status_code, 200)
+        self.assertFalse(any("users_revokedtoken" in query["sql"] for query in queries))
+
+    def test_other_process_revocation(self):
+        access = self.login()["access"]
+        self.assertEqual(self.me(access).status_code, 200)
+        # 다른 프로세스가 폐기하면 이 프로세스의 Bloom filter는 다음 확인 때 다시 만들어진다.
+        claims = tokens.decode(access, tokens.ACCESS)
+        RevokedToken.objects.create(
+            jti=claims["jti"],
+            expires_at=datetime.now(tz=timezone.utc) + timedelta(minutes=5),
+        )
+        with override_settings(JWT_DENYLIST_CHECK_INTERVAL=0):
+            self.assertEqual(self.me(access).json()["detail"], "Token revoked")
+
+
+class TestCachedTokenAuthentication(APITestCase):
+    URL = "/api/v1/users/me"
+
+    def setUp(self):
+        cache.users.clear()
+        cache.auth_tokens.clear()
+        shared_cache.clear()
+        self.user = User.objects.create(username="test")
+        self.token = Token.objects.create(user=self.user)
+
+    def get(self, key):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.URL, HTTP_AUTHORIZATION=f"Token {key}")
+        return response, len(queries)
+
+    def test_second_request_skips_lookup(self):
+        response, first = self.get(self.token.key)
+        self.assertEqual(response.status_code, 200)
+        response, second = self.get(self.token.key)
+        self.assertEqual(response.status_code, 200)
+        # 토큰 조회와 유저 조회가 빠진다.
+        self.assertEqual(second, first - 2)
+
+    def test_deleted_token(self):
+        self.get(self.token.key)
+        key = self.token.key
+        self.token.delete()
+        response, _ = self.get(key)
+        self.assertEqual(response.status_code, 403)
+
+    def test_inactive_user(self):
+        self.user.is_active = False
+        self.user.save()
+        response, _ = self.get(self.token.key)
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(USER_CACHE_SHARED=True)
+    def test_warm_command(self):
+        call_command("warm_token_cache", stdout=StringIO())
+        # 웹 서버 프로세스의 LRU는 비어 있어도 공용 캐시에서 토큰과 유저를 가져온다.
+        response, queries = self.get(self.token.key)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, 0)
+        self.assertEqual(
+            cache.get_token(self.token.key), (self.user.pk, self.token.created)
+        )
+        with self.assertNumQueries(0):
+            cache.get_user(self.user.pk)
+
+    def test_warm_needs_shared_cache(self):
+        with self.assertRaises(CommandError):
+            call_command("warm_token_cache", stdout=StringIO())
+
+
+class TestPasswordRehash(APITransactionTestCase):
+    def setUp(self):
+        cache.users.clear()
+        # 예전 기본값이었던 PBKDF2로 저장된 비밀번호
+        self.user = User.objects.create(
+            username="test",
+            password=make_password("123", hasher="pbkdf2_sha256"),
+        )
+
+    def wait(self):
+        # 작업 스레드가 하나라서 뒤에 넣은 작업이 끝나면 앞의 작업도 끝난 것이다.
+        hashers.executor.submit(lambda: None).result()
+
+    def test_settings(self):
+        self.assertEqual(
+            settings.PASSWORD_HASHERS[0], "users.hashers.ScryptPasswordHasher"
+        )
+        self.assertTrue(make_password("123").startswith("scrypt$"))
+
+    def test_jwt_login_rehashes_in_background(self):
+        response = self.client.post(
+            "/api/v1/users/jwt-login", {"username": "test", "password": "123"}
+        )
+        self.assertIn("access", response.json())
+        self.wait()
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("scrypt$"))
+        self.assertTrue(self.user.check_password("123"))
+
+    def test_background_failure_is_logged(self):
+        with mock.patch(
+            "users.hashers.make_password",
+            side_effect=OperationalError("database is locked"),
+        ), self.assertLogs("users.hashers", "ERROR") as logs:
+            response = self.client.post(
+                "/api/v1/users/jwt-login", {"username": "test", "password": "123"}
+            )
+            self.assertIn("access", response.json())
+            self.wait()
+        self.assertIn("database is locked", logs.output[0])
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$"))
+
+    def test_session_login_keeps_session(self):
+        response = self.client.post(
+            "/api/v1/users/log-in", {"username": "test", "password": "123"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("scrypt$"))
+        # 세션이 새 해시로 만들어졌으므로 로그아웃되지 않는다.
+        self.assertEqual(self.client.get("/api/v1/users/me").status_code, 200)
+
+    def test_concurrent_session_logins(self):
+        # 세션 로그인은 요청 스레드에서 자기 해시만 바꾸고, 다른 유저의 작업 뒤에 줄 서지 않는다.
+        usernames = [f"user{index}" for index in range(4)]
+        for username in usernames:
+            User.objects.create(
+                username=username, password=make_password("123", hasher="pbkdf2_sha256")
+            )
+        threads = {}
+
+        def record(user_pk, old_encoded, raw_password):
+            threads[user_pk] = threading.current_thread().name
+            rehash(user_pk, old_encoded, raw_password)
+
+        def log_in(username):
+            try:
+                client = APIClient()
+                response = client.post(
+                    "/api/v1/users/log-in", {"username": username, "password": "123"}
+                )
+                return response.status_code, client.get("/api/v1/users/me").status_code
+            finally:
+                connection.close()
+
+        rehash = hashers.rehash
+        with mock.patch("users.hashers.rehash", side_effect=record), mock.patch.object(
+            hashers.executor, "submit"
+        ) as submit, ThreadPoolExecutor(max_workers=len(usernames)) as pool:
+            results = list(pool.map(log_in, usernames))
+        self.assertEqual(results, [(200, 200)] * len(usernames))
+        submit.assert_not_called()
+        self.assertEqual(len(threads), len(usernames))
+        self.assertFalse(
+            any(name.startswith("password-rehash") for name in threads.values())
+        )
+        for user in User.objects.filter(username__in=usernames):
+            self.assertTrue(user.password.startswith("scrypt$"))
+
+    def test_changed_password_wins(self):
+        old_encoded = self.user.password
+        self.user.set_password("456")
+        self.user.save()
+        hashers.rehash(self.user.pk, old_encoded, "123")
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("456"))
+
+    def test_work_factor_upgrade(self):
+        self.user.set_password("123")
+        self.user.save()
+        with mock.patch.object(
+            hashers.ScryptPasswordHasher, "work_factor", 2**15
+        ), mock.patch.object(hashers.ScryptPasswordHasher, "maxmem", 256 * 2**15 * 8):
+            self.assertTrue(self.user.check_password("123"))
+            self.wait()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password.split("$")[1], str(2**15))
+
+    @override_settings(PASSWORD_REHASH_ASYNC=False)
+    def test_synchronous(self):
+        self.assertTrue(self.user.check_password("123"))
+        self.assertTrue(self.user.password.startswith("scrypt$"))
@@ -0,0 +1,168 @@
+import hashlib
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+import jwt
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Max
+from .models import RevokedToken
+
+ALGORITHM = "HS256"
+ACCESS = "access"
+REFRESH = "refresh"
+# 읽기 전용으로 쓸 수 있도록 자주 쓰는 값을 토큰에 함께 넣는다. (request.auth)
+# 저장할 수 있는 request.user는 항상 users.cache에서 불러온다.
+USER_CLAIMS = ("username", "is_host")
+
+
+class InvalidToken(Exception):
+    pass
+
+
+def encode(user, token_type, lifetime):
+    now = datetime.now(tz=timezone.utc)
+    payload = {
+        "type": token_type,
+        "pk": user.pk,
+        "jti": uuid.uuid4().hex,
+        "iat": now,
+        "exp": now + timedelta(seconds=lifetime),
+    }
+    if token_type == ACCESS:
+        payload.update({claim: getattr(user, claim) for claim in USER_CLAIMS})
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm=ALGORITHM)
+
+
+def issue_tokens(user):
+    return {
+        ACCESS: encode(user, ACCESS, settings.JWT_ACCESS_LIFETIME),
+        REFRESH: encode(user, REFRESH, settings.JWT_REFRESH_LIFETIME),
+    }
+
+
+def decode(token, token_type):
+    """Check the signature, expiry, type and revocation of a token; return its claims"""
+
+    try:
+        claims = jwt.decode(
+            token,
+            settings.SECRET_KEY,
+            algorithms=[ALGORITHM],
+            options={"require": ["exp", "jti", "type", "pk"]},
+        )
+    except jwt.ExpiredSignatureError:
+        raise InvalidToken("Token expired")
+    except jwt.InvalidTokenError:
+        raise InvalidToken("Invalid Token")
+    if claims["type"] != token_type:
+        raise InvalidToken("Invalid Token")
+    if denylist.contains(claims["jti"]):
+        raise InvalidToken("Token revoked")
+    return claims
+
+
+def revoke(claims):
+    """Revoke a token; raises InvalidToken if it was already revoked
+
+    A second revocation means the token was reused (e.g. a refresh token
+    sent twice), so the caller rejects it.
+    """
+
+    denylist.add(claims["jti"], datetime.fromtimestamp(claims["exp"], tz=timezone.utc))
+
+
+class BloomFilter:
+
+    """Fixed-size bit array answering "maybe present" or "surely absent" """
+
+    def __init__(self, size=2**20, hashes=7):
+        self.size = size
+        self.hashes = hashes
+        self.bits = bytearray(size // 8)
+
+    def positions(self, value):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + index * second) % self.size for index in range(self.hashes)]
+
+    def add(self, value):
+        for position in self.positions(value):
+            self.bits[position // 8] |= 1 << (position % 8)
+
+    def __contains__(self, value):
+        return all(
+            self.bits[position // 8] & (1 << (position % 8))
+            for position in self.positions(value)
+        )
+
+
+class Denylist:
+
+    """Revoked token ids, checked against a Bloom filter before the database
+
+    Almost every token is not revoked, and the per-process filter proves that
+    without a query. Every JWT_DENYLIST_CHECK_INTERVAL seconds the newest
+    RevokedToken id is read, and the filter is rebuilt when it moved, so a
+    revocation made by another process is seen within that interval. A
+    revocation made by this process is seen on the next request.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.filter = None
+        self.checked_at = None
+
+    def get_version(self):
+        # pk는 AUTOINCREMENT라서 폐기가 있을 때마다 커진다.
+        return RevokedToken.objects.aggregate(version=Max("pk"))["version"] or 0
+
+    def invalidate(self):
+        with self.lock:
+            self.checked_at = None
+
+    def get_filter(self):
+        with self.lock:
+            now = time.monotonic()
+            if (
+                self.checked_at is not None
+                and now - self.checked_at < settings.JWT_DENYLIST_CHECK_INTERVAL
+            ):
+                return self.filter
+            version = self.get_version()
+            if self.filter is None or version != self.version:
+                bloom = BloomFilter()
+                for jti in RevokedToken.objects.filter(
+                    expires_at__gt=datetime.now(tz=timezone.utc)
+                ).values_list("jti", flat=True):
+                    bloom.add(jti)
+                self.filter, self.version = bloom, version
+            self.checked_at = now
+            return self.filter
+
+    def contains(self, jti):
+        if jti not in self.get_filter():
+            return False
+        # Bloom filter는 가끔 없는 값도 있다고 하므로 DB에서 확인한다.
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+    def add(self, jti, expires_at):
+        # get_or_create를 쓰면 같은 refresh 토큰으로 동시에 들어온 두 요청이 모두 성공한다.
+        # jti의 unique 제약으로 먼저 넣은 쪽만 통과시킨다.
+        try:
+            with transaction.atomic():
+                RevokedToken.objects.create(jti=jti, expires_at=expires_at)
+        except IntegrityError:
+            raise InvalidToken("Token revoked")
+        # 만료된 토큰은 어차피 거절되므로 폐기 목록과 Bloom filter에서 뺀다.
+        RevokedToken.objects.filter(
+            expires_at__lt=datetime.now(tz=timezone.utc)
+        ).delete()
+        self.invalidate()
+        transaction.on_commit(self.invalidate)
+
+
+denylist = Denylist()
@@ -12,6 +12,8 @@ urlpatterns = [
     path("log-out", views.LogOut.as_view()),
     path("token-login", obtain_auth_token),
     path("jwt-login", views.JWTLogIn.as_view()),
+    path("jwt-refresh", views.JWTRefresh.as_view()),
+    path("jwt-logout", views.JWTLogOut.as_view()),
     path("github", views.GithubLogIn.as_view()),
     path("kakao", views.KakaoLogIn.as_view()),
     path("signup", views.SignUp.as_view()),
@@ -1,13 +1,14 @@
-import jwt
 import requests
 from django.conf import settings
 from django.contrib.auth import authenticate, login, logout
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import status
-from rest_framework.exceptions import ParseError, NotFound
+from rest_framework.exceptions import AuthenticationFailed, ParseError, NotFound
 from rest_framework.permissions import IsAuthenticated
-from . import serializers
+from . import serializers, tokens
+from .cache import get_user
+from .hashers import rehash_inline
 from .models import User
 
 
@@ -91,11 +92,13 @@ class LogIn(APIView):
         password = request.data.get("password")
         if not username or not password:
             raise ParseError
-        user = authenticate(
-            request,
-            username=username,
-            password=password,
-        )
+        # 세션에는 비밀번호 해시로 만든 값이 들어가므로 예전 해시는 이 요청에서 바로 바꾼다.
+        with rehash_inline():
+            user = authenticate(
+                request,
+                username=username,
+                password=password,
+            )
         if user:
             login(request, user)
             return Response({"ok": "Welcome!"})
@@ -126,16 +129,59 @@ class JWTLogIn(APIView):
             password=password,
         )
         if user:
-            token = jwt.encode(
-                {"pk": user.pk},
-                settings.SECRET_KEY,
-                algorithm="HS256",
-            )
-            return Response({"token": token})
+            issued = tokens.issue_tokens(user)
+            # 예전 클라이언트를 위해 access 토큰을 token으로도 보내준다.
+            return Response({"token": issued[tokens.ACCESS], **issued})
         else:
             return Response({"error": "wrong password"})
 
 
+class JWTRefresh(APIView):
+    def post(self, request):
+        refresh = request.data.get("refresh")
+        if not refresh:
+            raise ParseError
+        try:
+            claims = tokens.decode(refresh, tokens.REFRESH)
+        except tokens.InvalidToken as error:
+            raise AuthenticationFailed(str(error))
+        user = get_user(claims["pk"])
+        if user is None or not user.is_active:
+            raise AuthenticationFailed("User Not Found")
+        # refresh 토큰은 한 번만 쓸 수 있도록 바로 폐기한다. 동시에 쓰면 한 요청만 통과한다.
+        try:
+            tokens.revoke(claims)
+        except tokens.InvalidToken as error:
+            raise AuthenticationFailed(str(error))
+        return Response(tokens.issue_tokens(user))
+
+
+class JWTLogOut(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        refresh = request.data.get("refresh")
+        if refresh:
+            try:
+                claims = tokens.decode(refresh, tokens.REFRESH)
+            except tokens.InvalidToken as error:
+                raise ParseError(str(error))
+            if claims["pk"] != request.user.pk:
+                raise ParseError("Invalid Token")
+            try:
+                tokens.revoke(claims)
+            except tokens.InvalidToken as error:
+                raise ParseError(str(error))
+        # JWT로 인증된 요청이라면 지금 쓰고 있는 access 토큰도 폐기한다.
+        if isinstance(request.auth, dict) and request.auth.get("type") == tokens.ACCESS:
+            try:
+                tokens.revoke(request.auth)
+            except tokens.InvalidToken:
+                # 동시에 들어온 다른 로그아웃이 이미 폐기했다.
+                pass
+        return Response({"ok": "bye"})
+
+
 class GithubLogIn(APIView):
     def post(self, request):
         try:
@@ -0,0 +1,32 @@
+from collections import namedtuple
+from django.db.models import CharField, Value
+from .models import Wishlist
+
+LikedSet = namedtuple("LikedSet", ["rooms", "experiences"])
+
+EMPTY = LikedSet(frozenset(), frozenset())
+
+
+def get_liked(request):
+    """Room and experience pks saved in the user's wishlists
+
+    Loaded with one query the first time a serializer asks during a request
+    and kept on the request, so every object in the response reuses it.
+    """
+
+    if request is None or not request.user.is_authenticated:
+        return EMPTY
+    liked = getattr(request, "_liked", None)
+    if liked is None:
+        rooms = Wishlist.rooms.through.objects.filter(
+            wishlist__user=request.user
+        ).values_list(Value("room", output_field=CharField()), "room_id")
+        experiences = Wishlist.experiences.through.objects.filter(
+            wishlist__user=request.user
+        ).values_list(Value("experience", output_field=CharField()), "experience_id")
+        room_pks, experience_pks = set(), set()
+        for kind, pk in rooms.union(experiences, all=True):
+            (room_pks if kind == "room" else experience_pks).add(pk)
+        liked = LikedSet(frozenset(room_pks), frozenset(experience_pks))
+        request._liked = liked
+    return liked
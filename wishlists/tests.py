@@ -1,3 +1,80 @@
-from django.test import TestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from experiences.models import Experience
+from common.testing import build_room
+from rooms.models import Room
+from users.models import User
+from .models import Wishlist
 
-# Create your tests here.
+
+class TestLikedSet(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="test")
+        self.wishlist = Wishlist.objects.create(name="Trip", user=self.user)
+        self.client.force_authenticate(self.user)
+
+    def create_rooms(self, count):
+        return Room.objects.bulk_create(
+            [build_room(self.user, name=f"Room {index}") for index in range(count)]
+        )
+
+    def create_experiences(self, count):
+        return Experience.objects.bulk_create(
+            [
+                Experience(
+                    name=f"Experience {index}",
+                    host=self.user,
+                    price=1000,
+                    address="123",
+                    start="10:00",
+                    end="12:00",
+                    description="Experience",
+                )
+                for index in range(count)
+            ]
+        )
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.json(), len(context)
+
+    def test_room_list(self):
+        rooms = self.create_rooms(4)
+        self.wishlist.rooms.add(rooms[0], rooms[2])
+        data, _ = self.count_queries("/api/v1/rooms/")
+        liked = {room["pk"] for room in data["results"] if room["is_liked"]}
+        self.assertEqual(liked, {rooms[0].pk, rooms[2].pk})
+
+    def test_experience_list(self):
+        experiences = self.create_experiences(3)
+        self.wishlist.experiences.add(experiences[1])
+        data, _ = self.count_queries("/api/v1/experiences/")
+        liked = [
+            experience["pk"] for experience in data["results"] if experience["is_liked"]
+        ]
+        self.assertEqual(liked, [experiences[1].pk])
+
+    def test_liked_set_is_loaded_once(self):
+        rooms = self.create_rooms(10)
+        self.wishlist.rooms.add(*rooms)
+        _, queries = self.count_queries("/api/v1/rooms/")
+        # 방 목록, 사진, 위시리스트 각각 한 번
+        self.assertEqual(queries, 3)
+
+    def test_wishlists_query_count(self):
+        self.wishlist.rooms.add(*self.create_rooms(2))
+        self.wishlist.experiences.add(*self.create_experiences(2))
+        _, few = self.count_queries("/api/v1/wishlists/")
+
+        self.wishlist.rooms.add(*self.create_rooms(20))
+        other = Wishlist.objects.create(name="Other", user=self.user)
+        other.rooms.add(*self.create_rooms(5))
+        data, many = self.count_queries("/api/v1/wishlists/")
+
+        self.assertEqual(few, many)
+        self.assertTrue(
+            all(room["is_liked"] for wishlist in data for room in wishlist["rooms"])
+        )
@@ -14,7 +14,11 @@ class Wishlists(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        all_wishlists = Wishlist.objects.filter(user=request.user)
+        # 위시리스트 안의 방/체험과 사진을 한 번에 가져온다. is_liked는 get_liked가 한 번만 조회한다.
+        all_wishlists = Wishlist.objects.filter(user=request.user).prefetch_related(
+            "rooms__photos",
+            "experiences__photos",
+        )
         serializer = WishlistSerializer(
             all_wishlists,
             many=True,
@@ -28,7 +32,7 @@ class Wishlists(APIView):
             wishlist = serializer.save(
                 user=request.user,
             )
-            serializer = WishlistSerializer(wishlist)
+            serializer = WishlistSerializer(wishlist, context={"request": request})
             return Response(serializer.data)
         else:
             return Response(serializer.errors)
@@ -68,7 +72,7 @@ class WishlistDetail(APIView):
         )
         if serializer.is_valid():
             wishlist = serializer.save()
-            serializer = WishlistSerializer(wishlist)
+            serializer = WishlistSerializer(wishlist, context={"request": request})
             return Response(serializer.data)
         else:
             return Response(serializer.errors)